@@ -9,6 +9,7 @@ using AI-powered processing with Ollama.
 from pathlib import Path
 
 from scixtract import AdvancedPDFProcessor
+from scixtract.cli import write_json_output
 
 
 def main():
@@ -38,14 +39,19 @@ def main():
         print("🤖 Starting AI processing...")
         result = processor.process_pdf(pdf_path)
 
+        authors_str = (
+            ", ".join(result.metadata.authors) if result.metadata.authors else "Unknown"
+        )
+        content_types_str = ", ".join(
+            sorted({page.content_type for page in result.pages})
+        )
+
         # Display results
         print(
             f"\n✅ Processing completed in {result.metadata.processing_time:.1f} seconds"
         )
         print(f"📄 Document: {result.metadata.title or pdf_path.stem}")
-        print(
-            f"👥 Authors: {', '.join(result.metadata.authors) if result.metadata.authors else 'Unknown'}"
-        )
+        print(f"👥 Authors: {authors_str}")
         print(f"📅 Year: {result.metadata.year or 'Unknown'}")
         print(f"📊 Pages processed: {len(result.pages)}")
         print(f"🔑 Keywords extracted: {len(result.all_keywords)}")
@@ -63,8 +69,7 @@ def main():
                 print(f"   {i}. {concept}")
 
         # Show content types found
-        content_types = set(page.content_type for page in result.pages)
-        print(f"\n📋 Content Types Found: {', '.join(sorted(content_types))}")
+        print(f"\n📋 Content Types Found: {content_types_str}")
 
         # Save results to files
         output_dir = Path("output")
@@ -74,34 +79,28 @@ def main():
 
         # Save JSON data
         json_file = output_dir / f"{base_name}_extraction.json"
-        with open(json_file, "w", encoding="utf-8") as f:
-            import json
-
-            json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
+        write_json_output(json_file, result.to_dict())
 
         # Save simple text summary
         summary_file = output_dir / f"{base_name}_summary.txt"
-        with open(summary_file, "w", encoding="utf-8") as f:
-            f.write(f"PDF Extraction Summary\n")
-            f.write(f"====================\n\n")
-            f.write(f"File: {pdf_path.name}\n")
-            f.write(f"Title: {result.metadata.title or 'Unknown'}\n")
-            f.write(
-                f"Authors: {', '.join(result.metadata.authors) if result.metadata.authors else 'Unknown'}\n"
-            )
-            f.write(f"Year: {result.metadata.year or 'Unknown'}\n")
-            f.write(f"Pages: {len(result.pages)}\n")
-            f.write(f"Processing time: {result.metadata.processing_time:.1f}s\n\n")
-
-            f.write(f"Keywords ({len(result.all_keywords)}):\n")
-            for keyword in result.all_keywords:
-                f.write(f"  - {keyword}\n")
-
-            f.write(f"\nKey Concepts ({len(result.key_concepts)}):\n")
-            for concept in result.key_concepts:
-                f.write(f"  - {concept}\n")
-
-            f.write(f"\nContent Types: {', '.join(sorted(content_types))}\n")
+        summary = [
+            "PDF Extraction Summary",
+            "====================",
+            "",
+            f"File: {pdf_path.name}",
+            f"Title: {result.metadata.title or 'Unknown'}",
+            f"Authors: {authors_str}",
+            f"Year: {result.metadata.year or 'Unknown'}",
+            f"Pages: {len(result.pages)}",
+            f"Processing time: {result.metadata.processing_time:.1f}s",
+            "",
+            f"Keywords ({len(result.all_keywords)}):",
+        ]
+        summary.extend(f"  - {keyword}" for keyword in result.all_keywords)
+        summary.extend(["", f"Key Concepts ({len(result.key_concepts)}):"])
+        summary.extend(f"  - {concept}" for concept in result.key_concepts)
+        summary.extend(["", f"Content Types: {content_types_str}", ""])
+        summary_file.write_text("\n".join(summary), encoding="utf-8")
 
         print(f"\n💾 Results saved:")
         print(f"   📄 JSON data: {json_file}")
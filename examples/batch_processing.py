@@ -6,16 +6,43 @@ This example shows how to process multiple PDF files and build
 a comprehensive knowledge base from academic papers.
 """
 
+import os
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from scixtract import AdvancedPDFProcessor, KnowledgeTracker
+from scixtract import AdvancedPDFProcessor, KnowledgeTracker, OllamaAIProcessor
+
+# Processor owned by each worker (created once by the pool initializer)
+_worker = threading.local()
+
+
+def _init_worker(model: str, bib_file: Path = None):
+    """Create one processor per worker so the bibliography is parsed once."""
+    _worker.processor = AdvancedPDFProcessor(model=model, bib_file=bib_file)
+
+
+def _process_one(pdf_path: Path, bib_file: Path = None):
+    """Process a single PDF in a worker."""
+    return _worker.processor.process_pdf(pdf_path, bib_file)
 
 
 def process_pdf_batch(
-    pdf_directory: Path, bib_file: Path = None, model: str = "qwen2.5:7b"
+    pdf_directory: Path,
+    bib_file: Path = None,
+    model: str = "qwen2.5:7b",
+    max_workers: int = None,
+    use_threads: bool = False,
 ):
-    """Process all PDFs in a directory and build knowledge base."""
+    """Process all PDFs in a directory and build knowledge base.
+
+    PDFs are independent, so they are processed in a pool of worker
+    processes. With ``use_threads=True`` a thread pool is used instead,
+    which is lighter when the run is dominated by waiting on Ollama.
+    ``max_workers`` also bounds the number of concurrent requests sent
+    to the Ollama server.
+    """
 
     # Find all PDF files
     pdf_files = list(pdf_directory.glob("*.pdf"))
@@ -26,39 +53,66 @@ def process_pdf_batch(
 
     print(f"📚 Found {len(pdf_files)} PDF files to process")
 
-    # Initialize processor and knowledge tracker
-    processor = AdvancedPDFProcessor(model=model, bib_file=bib_file)
+    # Initialize knowledge tracker (written to from this process only)
     tracker = KnowledgeTracker()
 
-    if not processor.ai.available:
+    if not OllamaAIProcessor(model).available:
         print(f"❌ Ollama not available with model {model}")
         print("Please install Ollama and run:")
         print(f"   ollama pull {model}")
         return
 
-    # Process each PDF
+    if use_threads:
+        executor_class = ThreadPoolExecutor
+        if max_workers is None:
+            max_workers = min(len(pdf_files), 8)
+        print(f"⚙️  Using {max_workers} worker thread(s)")
+    else:
+        executor_class = ProcessPoolExecutor
+        if max_workers is None:
+            max_workers = min(len(pdf_files), os.cpu_count() or 1)
+        print(f"⚙️  Using {max_workers} worker process(es)")
+
+    # Process PDFs in parallel
     results = []
+    total_processing_time = 0.0
+    total_keywords = 0
+    total_pages = 0
     total_start_time = time.time()
 
-    for i, pdf_path in enumerate(pdf_files, 1):
-        print(f"\n📄 Processing {i}/{len(pdf_files)}: {pdf_path.name}")
-
-        try:
-            # Process PDF
-            result = processor.process_pdf(pdf_path, bib_file)
-            results.append(result)
-
-            # Add to knowledge base
-            tracker.add_extraction_result(result.to_dict(), str(pdf_path))
-
-            # Show progress
-            print(f"   ✅ Completed in {result.metadata.processing_time:.1f}s")
-            print(f"   🔑 Keywords: {len(result.all_keywords)}")
-            print(f"   📊 Pages: {len(result.pages)}")
-
-        except Exception as e:
-            print(f"   ❌ Failed: {e}")
-            continue
+    # Index every result in a single knowledge base transaction
+    with tracker.batch(), executor_class(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(model, bib_file),
+    ) as executor:
+        futures = {
+            executor.submit(_process_one, pdf_path, bib_file): pdf_path
+            for pdf_path in pdf_files
+        }
+
+        for i, future in enumerate(as_completed(futures), 1):
+            pdf_path = futures[future]
+            print(f"\n📄 Finished {i}/{len(pdf_files)}: {pdf_path.name}")
+
+            try:
+                result = future.result()
+                results.append(result)
+                total_processing_time += result.metadata.processing_time
+                total_keywords += len(result.all_keywords)
+                total_pages += len(result.pages)
+
+                # Add to knowledge base
+                tracker.add_extraction_result(result.to_dict(), str(pdf_path))
+
+                # Show progress
+                print(f"   ✅ Completed in {result.metadata.processing_time:.1f}s")
+                print(f"   🔑 Keywords: {len(result.all_keywords)}")
+                print(f"   📊 Pages: {len(result.pages)}")
+
+            except Exception as e:
+                print(f"   ❌ Failed: {e}")
+                continue
 
     total_time = time.time() - total_start_time
 
@@ -68,9 +122,7 @@ def process_pdf_batch(
     print(f"📚 Successfully processed: {len(results)}/{len(pdf_files)} files")
 
     if results:
-        avg_time = sum(r.metadata.processing_time for r in results) / len(results)
-        total_keywords = sum(len(r.all_keywords) for r in results)
-        total_pages = sum(len(r.pages) for r in results)
+        avg_time = total_processing_time / len(results)
 
         print(f"📊 Statistics:")
         print(f"   Average processing time: {avg_time:.1f}s per document")
@@ -107,10 +159,20 @@ def demonstrate_knowledge_search(tracker: KnowledgeTracker):
 
     # Example searches
     search_terms = ["catalysis", "ammonia", "electrochemical", "NOx", "synthesis"]
-
-    for term in search_terms:
-        results = tracker.search_keywords(term, limit=3)
-
+    concepts = ["catalysis", "ammonia"]
+
+    # Each query opens its own read connection, so they can run side by side
+    with ThreadPoolExecutor(max_workers=len(search_terms)) as executor:
+        search_futures = [
+            executor.submit(tracker.search_keywords, term, 3) for term in search_terms
+        ]
+        related_futures = [
+            executor.submit(tracker.get_related_concepts, concept, 5)
+            for concept in concepts
+        ]
+
+    for term, future in zip(search_terms, search_futures):
+        results = future.result()
         if results:
             print(f"\n🔎 Search: '{term}' ({len(results)} results)")
             for result in results[:2]:  # Show top 2 results
@@ -128,8 +190,8 @@ def demonstrate_knowledge_search(tracker: KnowledgeTracker):
     print(f"\n🔗 Related Concepts Demo")
     print(f"=" * 30)
 
-    for concept in ["catalysis", "ammonia"]:
-        related = tracker.get_related_concepts(concept, limit=5)
+    for concept, future in zip(concepts, related_futures):
+        related = future.result()
         if related:
             print(f"\n💡 Concepts related to '{concept}':")
             for related_concept, count in related:
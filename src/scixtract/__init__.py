@@ -12,15 +12,45 @@ __version__ = "1.0.5"
 __author__ = "Reto Stamm"
 __email__ = "reto.stamm@ul.ie"
 
-from .extractor import AdvancedPDFProcessor, OllamaAIProcessor
-from .knowledge import KnowledgeTracker
-from .models import DocumentMetadata, ExtractionResult, PageContent
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .extractor import AdvancedPDFProcessor, OllamaAIProcessor, OllamaError
+    from .knowledge import KnowledgeTracker
+    from .models import DocumentMetadata, ExtractionResult, PageContent
+
+# Public names are imported on first access so that importing the package
+# (e.g. for the CLI) does not pull in PyMuPDF, requests and sqlite up front.
+_LAZY_IMPORTS = {
+    "AdvancedPDFProcessor": ".extractor",
+    "OllamaAIProcessor": ".extractor",
+    "OllamaError": ".extractor",
+    "KnowledgeTracker": ".knowledge",
+    "DocumentMetadata": ".models",
+    "PageContent": ".models",
+    "ExtractionResult": ".models",
+}
 
 __all__ = [
     "AdvancedPDFProcessor",
     "OllamaAIProcessor",
+    "OllamaError",
     "KnowledgeTracker",
     "DocumentMetadata",
     "PageContent",
     "ExtractionResult",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
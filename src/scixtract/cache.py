@@ -0,0 +1,48 @@
+"""
+On-disk cache helpers shared by the extraction pipeline.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+
+def cache_dir() -> Path:
+    """Return the scixtract cache directory.
+
+    Uses ``SCIXTRACT_CACHE_DIR`` if set, otherwise ``$XDG_CACHE_HOME/scixtract``
+    (defaulting to ``~/.cache/scixtract``).
+    """
+    override = os.getenv("SCIXTRACT_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    base = os.getenv("XDG_CACHE_HOME") or "~/.cache"
+    return Path(base).expanduser() / "scixtract"
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text to a file atomically via a temporary file and rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+    ) as tmp:
+        tmp.write(text)
+    os.replace(tmp.name, path)
+
+
+def read_json(path: Path) -> Optional[Any]:
+    """Read a JSON cache file, returning None if it is missing or corrupt."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: Path, data: Any) -> None:
+    """Write a JSON cache file atomically, ignoring filesystem errors."""
+    try:
+        atomic_write_text(path, json.dumps(data, ensure_ascii=False))
+    except OSError:
+        pass
@@ -7,13 +7,65 @@ import json
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
 
-from .config import ConfigManager
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from .config import load_config_manager
 from .extractor import AdvancedPDFProcessor
 from .knowledge import KnowledgeTracker
 from .models import ExtractionResult
 
+_TRUE_VALUES = frozenset({"true", "1", "yes", "on"})
+_FALSE_VALUES = frozenset({"false", "0", "no", "off"})
+
+MARKDOWN_BUFFER_SIZE = 64 * 1024
+
+_MARKDOWN_HEADER = "\n".join(
+    [
+        "# {title}",
+        "",
+        "## Document Information",
+        "",
+        "**Citation Key:** `{cite_key}`  ",
+        "**Authors:** {authors}  ",
+        "**Year:** {year}  ",
+        "**Journal:** {journal}  ",
+        "**DOI:** {doi}  ",
+        "**Processed:** {extraction_date}  ",
+        "",
+        "## Keywords and Concepts",
+        "",
+        "**Keywords:** {keywords}  ",
+        "**Key Concepts:** {key_concepts}  ",
+        "",
+        "---",
+        "",
+    ]
+)
+
+_MARKDOWN_SECTION = "## {title}\n"
+
+_MARKDOWN_PAGE = "### Page {page}\n\n{content}\n"
+
+_MARKDOWN_STRUCTURED = "**Structured Information:**\n\n```json\n{data}\n```\n"
+
+_SECTION_ORDER = (
+    "abstract",
+    "introduction",
+    "methods",
+    "results",
+    "discussion",
+    "conclusion",
+    "main",
+    "blank",
+)
+
 
 def parse_makefile_args(args_list: List[str]) -> Tuple[Dict[str, Any], List[str]]:
     """Parse Makefile-style KEY=VALUE arguments."""
@@ -21,158 +73,162 @@ def parse_makefile_args(args_list: List[str]) -> Tuple[Dict[str, Any], List[str]
     remaining_args: List[str] = []
 
     for arg in args_list:
-        if "=" in arg and not arg.startswith("-"):
-            key, value_str = arg.split("=", 1)
-            # Convert to lowercase and handle boolean values
-            key = key.lower()
-            value: Union[str, bool] = value_str
-            if value_str.lower() in ["true", "1", "yes", "on"]:
-                value = True
-            elif value_str.lower() in ["false", "0", "no", "off"]:
-                value = False
-            makefile_args[key] = value
-        else:
+        key, sep, value_str = arg.partition("=")
+        if not sep or arg.startswith("-"):
             remaining_args.append(arg)
+            continue
+
+        # Convert to lowercase and handle boolean values
+        lowered = value_str.lower()
+        value: Union[str, bool] = value_str
+        if lowered in _TRUE_VALUES:
+            value = True
+        elif lowered in _FALSE_VALUES:
+            value = False
+        makefile_args[key.lower()] = value
 
     return makefile_args, remaining_args
 
 
+def encode_json(data: Any) -> bytes:
+    """Encode data as indented UTF-8 JSON, using orjson when available."""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            pass  # Fall back to the standard library encoder
+
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def write_json_output(path: Path, data: Any) -> None:
+    """Write an output file as indented UTF-8 JSON.
+
+    Unlike ``cache.write_json`` this is a plain write that raises on errors.
+    """
+    path.write_bytes(encode_json(data))
+
+
 def save_results(
-    result: ExtractionResult, output_dir: Path, pdf_path: Path
+    result: ExtractionResult,
+    output_dir: Path,
+    pdf_path: Path,
+    extraction_data: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, str]:
-    """Save extraction results in multiple formats."""
+    """Save extraction results in multiple formats.
+
+    ``extraction_data`` may be passed to reuse an already-built
+    ``result.to_dict()``.
+    """
     base_name = pdf_path.stem
-    saved_files = {}
+    if extraction_data is None:
+        extraction_data = result.to_dict()
+
+    # Encode the JSON outputs up front so an encoding error writes nothing
+    extraction_content = encode_json(extraction_data)
+    keywords_content = encode_json(
+        {
+            "cite_key": result.metadata.cite_key,
+            "title": result.metadata.title,
+            "keywords": result.all_keywords,
+            "key_concepts": result.key_concepts,
+            "extraction_date": result.metadata.extraction_date,
+        }
+    )
 
     # Ensure output directory exists
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Save raw extraction data
     raw_file = output_dir / f"{base_name}_ai_extraction.json"
-    with open(raw_file, "w", encoding="utf-8") as f:
-        json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
-    saved_files["extraction_data"] = str(raw_file)
+    raw_file.write_bytes(extraction_content)
 
-    # Save structured markdown
+    # Stream structured markdown straight to disk
     md_file = output_dir / f"{base_name}_ai_processed.md"
-    markdown_content = generate_markdown(result, pdf_path)
-    with open(md_file, "w", encoding="utf-8") as f:
-        f.write(markdown_content)
-    saved_files["markdown"] = str(md_file)
+    with open(md_file, "w", encoding="utf-8", buffering=MARKDOWN_BUFFER_SIZE) as f:
+        write_markdown(result, pdf_path, f)
 
     # Save keyword index
     keywords_file = output_dir / f"{base_name}_keywords.json"
-    with open(keywords_file, "w", encoding="utf-8") as f:
-        json.dump(
-            {
-                "cite_key": result.metadata.cite_key,
-                "title": result.metadata.title,
-                "keywords": result.all_keywords,
-                "key_concepts": result.key_concepts,
-                "extraction_date": result.metadata.extraction_date,
-            },
-            f,
-            indent=2,
-            ensure_ascii=False,
-        )
-    saved_files["keywords"] = str(keywords_file)
+    keywords_file.write_bytes(keywords_content)
 
-    return saved_files
+    return {
+        "extraction_data": str(raw_file),
+        "markdown": str(md_file),
+        "keywords": str(keywords_file),
+    }
 
 
-def generate_markdown(result: ExtractionResult, pdf_path: Path) -> str:
-    """Generate structured markdown from extraction result."""
-    lines = []
+def _markdown_blocks(result: ExtractionResult, pdf_path: Path) -> Iterator[str]:
+    """Yield the blocks of the markdown document in order."""
     metadata = result.metadata
 
-    # Prepare author string
-    authors_str = ", ".join(metadata.authors) if metadata.authors else "Unknown"
-
-    # Header with metadata
-    lines.extend(
-        [
-            f"# {metadata.title or pdf_path.stem.replace('_', ' ').title()}",
-            "",
-            "## Document Information",
-            "",
-            f"**Citation Key:** `{metadata.cite_key}`  ",
-            f"**Authors:** {authors_str}  ",
-            f"**Year:** {metadata.year or 'Unknown'}  ",
-            f"**Journal:** {metadata.journal or 'Unknown'}  ",
-            f"**DOI:** {metadata.doi or 'Not available'}  ",
-            f"**Processed:** {metadata.extraction_date}  ",
-            "",
-            "## Keywords and Concepts",
-            "",
-            f"**Keywords:** {', '.join(result.all_keywords[:15])}  ",
-            f"**Key Concepts:** {', '.join(result.key_concepts[:10])}  ",
-            "",
-            "---",
-            "",
-        ]
+    yield _MARKDOWN_HEADER.format(
+        title=metadata.title or pdf_path.stem.replace("_", " ").title(),
+        cite_key=metadata.cite_key,
+        authors=", ".join(metadata.authors) if metadata.authors else "Unknown",
+        year=metadata.year or "Unknown",
+        journal=metadata.journal or "Unknown",
+        doi=metadata.doi or "Not available",
+        extraction_date=metadata.extraction_date,
+        keywords=", ".join(result.all_keywords[:15]),
+        key_concepts=", ".join(result.key_concepts[:10]),
     )
 
-    # Process sections
-    section_order = [
-        "abstract",
-        "introduction",
-        "methods",
-        "results",
-        "discussion",
-        "conclusion",
-        "main",
-    ]
+    for section_type in _SECTION_ORDER:
+        if section_type not in result.sections:
+            continue
+        yield _MARKDOWN_SECTION.format(title=section_type.title())
+
+        for item in result.sections[section_type]:
+            yield _MARKDOWN_PAGE.format(page=item["page"], content=item["content"])
 
-    for section_type in section_order:
-        if section_type in result.sections:
-            section_data = result.sections[section_type]
-            lines.extend([f"## {section_type.title()}", ""])
-
-            for item in section_data:
-                lines.extend([f"### Page {item['page']}", "", item["content"], ""])
-
-                # Add structured data if available
-                if (
-                    item.get("structured")
-                    and "extraction_error" not in item["structured"]
-                ):
-                    lines.extend(
-                        [
-                            "**Structured Information:**",
-                            "",
-                            "```json",
-                            json.dumps(item["structured"], indent=2),
-                            "```",
-                            "",
-                        ]
-                    )
+            # Add structured data if available
+            structured = item.get("structured")
+            if structured and "extraction_error" not in structured:
+                yield _MARKDOWN_STRUCTURED.format(data=json.dumps(structured, indent=2))
 
     # Add references section if exists
     if "references" in result.sections:
-        lines.extend(["## References", ""])
+        yield _MARKDOWN_SECTION.format(title="References")
         for item in result.sections["references"]:
-            lines.extend([f"### Page {item['page']}", "", item["content"], ""])
+            yield _MARKDOWN_PAGE.format(page=item["page"], content=item["content"])
+
 
-    return "\n".join(lines)
+def write_markdown(result: ExtractionResult, pdf_path: Path, fh: TextIO) -> None:
+    """Write structured markdown for an extraction result to a text stream."""
+    separator = ""
+    for block in _markdown_blocks(result, pdf_path):
+        fh.write(separator)
+        fh.write(block)
+        separator = "\n"
+
+
+def generate_markdown(result: ExtractionResult, pdf_path: Path) -> str:
+    """Generate structured markdown from extraction result."""
+    return "\n".join(_markdown_blocks(result, pdf_path))
 
 
 def extract_command(args: argparse.Namespace) -> None:
     """Handle PDF extraction command."""
+    # Fail fast on a mistyped path, before loading config or the processor
+    pdf_path = Path(args.pdf_file)
+
+    if not pdf_path.exists():
+        print(f"❌ PDF file not found: {args.pdf_file}")
+        sys.exit(1)
+
     # Parse Makefile-style arguments from remaining args
     makefile_args = {}
     if hasattr(args, "makefile_args"):
         makefile_args = args.makefile_args
 
     # Load configuration
-    config_manager = ConfigManager(getattr(args, "config", None))
+    config_manager = load_config_manager(getattr(args, "config", None))
     config = config_manager.config
 
-    pdf_path = Path(args.pdf_file)
-
-    if not pdf_path.exists():
-        print(f"❌ PDF file not found: {args.pdf_file}")
-        sys.exit(1)
-
     # Setup output directory (Makefile args > command line > config)
     output_dir_path = (
         makefile_args.get("output_dir")
@@ -197,9 +253,8 @@ def extract_command(args: argparse.Namespace) -> None:
         or config.ollama.model
     )
 
-    # Initialize processor with config
-    processor = AdvancedPDFProcessor(model, bib_file)
-    processor.ai.base_url = config.ollama.base_url
+    # Initialize processor with config; OLLAMA_HOSTS overrides the base URL
+    processor = AdvancedPDFProcessor(model, bib_file, base_url=config.ollama.base_url)
 
     if not processor.ai.available:
         print("❌ Ollama not available. Please install Ollama and run:")
@@ -216,7 +271,8 @@ def extract_command(args: argparse.Namespace) -> None:
 
         # Save results
         print("💾 Saving results...")
-        saved_files = save_results(result, output_dir, pdf_path)
+        extraction_data = result.to_dict()
+        saved_files = save_results(result, output_dir, pdf_path, extraction_data)
 
         # Update knowledge tracker if requested (Makefile args > command line > config)
         update_knowledge = makefile_args.get("update_knowledge") or getattr(
@@ -232,11 +288,6 @@ def extract_command(args: argparse.Namespace) -> None:
                 getattr(args, "knowledge_db", None) or config.knowledge.db_path
             )
             tracker = KnowledgeTracker(Path(knowledge_db) if knowledge_db else None)
-
-            # Load the saved extraction data
-            with open(saved_files["extraction_data"], "r", encoding="utf-8") as f:
-                extraction_data = json.load(f)
-
             tracker.add_extraction_result(extraction_data, str(pdf_path))
             print("✅ Knowledge index updated")
 
@@ -258,7 +309,7 @@ def extract_command(args: argparse.Namespace) -> None:
 def knowledge_command(args: argparse.Namespace) -> None:
     """Handle knowledge management commands."""
     # Load configuration
-    config_manager = ConfigManager(getattr(args, "config", None))
+    config_manager = load_config_manager(getattr(args, "config", None))
     config = config_manager.config
 
     # Use knowledge DB from config or command line
@@ -319,14 +370,13 @@ def knowledge_command(args: argparse.Namespace) -> None:
 
 def config_command(args: argparse.Namespace) -> None:
     """Handle configuration management commands."""
-    config_manager = ConfigManager(getattr(args, "config", None))
+    config_manager = load_config_manager(getattr(args, "config", None))
 
     if args.create_example:
         example_config = config_manager.create_example_config(args.create_example)
 
         if args.output:
-            with open(args.output, "w", encoding="utf-8") as f:
-                f.write(example_config)
+            Path(args.output).write_text(example_config, encoding="utf-8")
             print(f"✅ Example configuration saved to: {args.output}")
         else:
             print("📋 Example Configuration:")
@@ -338,6 +388,7 @@ def config_command(args: argparse.Namespace) -> None:
 
     elif args.save:
         config_manager.save_config(args.save)
+        print(f"✅ Configuration saved to: {Path(args.save).expanduser()}")
 
     else:
         print("📋 Configuration Management")
@@ -363,7 +414,7 @@ def main() -> None:
   scixtract knowledge --search "catalysis"
 
   # Configuration management
-  scixtract config --create-example json
+  scixtract config --create-example toml
   scixtract config --show
         """,
     )
@@ -423,8 +474,10 @@ def main() -> None:
     config_parser = subparsers.add_parser("config", help="Manage configuration")
     config_parser.add_argument(
         "--create-example",
-        choices=["json", "yaml"],
-        help="Create example configuration file",
+        nargs="?",
+        const="toml",
+        choices=["toml"],
+        help="Create example TOML configuration file",
     )
     config_parser.add_argument(
         "--output", "-o", help="Output file path for example config"
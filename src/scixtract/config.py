@@ -2,16 +2,27 @@
 Configuration management for scixtract using TOML.
 """
 
+import functools
+import logging
 import os
 import sys
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional, Tuple
 
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    import tomli as tomllib
+import tomli_w
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_tomllib() -> Any:
+    """Import the TOML parser on first use, as most runs have no config file."""
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        import tomli as tomllib
+    return tomllib
 
 
 @dataclass
@@ -61,20 +72,58 @@ class Config:
         self.knowledge = KnowledgeConfig()
 
 
+def _apply(section: Any, section_data: dict[str, Any]) -> None:
+    """Copy known fields from ``section_data`` onto a config section."""
+    for f in fields(section):
+        if f.name in section_data:
+            setattr(section, f.name, section_data[f.name])
+
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() in ("true", "1", "yes")
+
+
+# Environment variable -> (config section, field, converter); env overrides files
+_ENV_MAP: Tuple[Tuple[str, str, str, Callable[[str], Any]], ...] = (
+    ("SCIXTRACT_OLLAMA_BASE_URL", "ollama", "base_url", str),
+    ("SCIXTRACT_OLLAMA_MODEL", "ollama", "model", str),
+    ("SCIXTRACT_OLLAMA_TIMEOUT", "ollama", "timeout", int),
+    ("SCIXTRACT_OLLAMA_TEMPERATURE", "ollama", "temperature", float),
+    ("SCIXTRACT_OUTPUT_DIR", "extraction", "output_dir", str),
+    ("SCIXTRACT_UPDATE_KNOWLEDGE", "extraction", "update_knowledge", _parse_bool),
+    ("SCIXTRACT_KNOWLEDGE_DB_PATH", "knowledge", "db_path", str),
+)
+
+
 class ConfigManager:
     """Simple TOML-based config manager."""
 
-    CONFIG_PATHS = [
-        "scixtract.toml",
-        "~/.config/scixtract/config.toml",
-        "~/.scixtract.toml",
-    ]
+    # Expanded once at import time rather than on every lookup
+    CONFIG_PATHS: Tuple[str, ...] = tuple(
+        os.path.expanduser(path)
+        for path in (
+            "scixtract.toml",
+            "~/.config/scixtract/config.toml",
+            "~/.scixtract.toml",
+        )
+    )
 
     def __init__(self, config_path: Optional[str] = None):
         """Initialize config manager."""
         self.config_path = config_path
-        self.config = Config()
-        self.load_config()
+        self._config: Optional[Config] = None
+
+    @property
+    def config(self) -> Config:
+        """Current configuration, loaded from file and environment on first use."""
+        if self._config is None:
+            self._config = Config()
+            self.load_config()
+        return self._config
+
+    @config.setter
+    def config(self, value: Config) -> None:
+        self._config = value
 
     def find_config_file(self) -> Optional[Path]:
         """Find the first existing configuration file."""
@@ -88,10 +137,9 @@ class ConfigManager:
                 )
 
         # Search for default config files
-        for config_path in self.CONFIG_PATHS:
-            config_file = Path(config_path).expanduser()
-            if config_file.exists():
-                return config_file
+        for candidate in self.CONFIG_PATHS:
+            if os.path.isfile(candidate):
+                return Path(candidate)
 
         return None
 
@@ -102,10 +150,10 @@ class ConfigManager:
         if config_file:
             try:
                 with open(config_file, "rb") as f:
-                    data = tomllib.load(f)
+                    data = _get_tomllib().load(f)
                 self._update_from_dict(data)
             except Exception as e:
-                print(f"Warning: Could not load config file {config_file}: {e}")
+                logger.warning("Could not load config file %s: %s", config_file, e)
 
         # Load from environment variables (override file config)
         self._load_from_environment()
@@ -153,62 +201,21 @@ export_format = "json"
 
     def _update_from_dict(self, data: dict[str, Any]) -> None:
         """Update config from dictionary data."""
-        if "ollama" in data:
-            ollama_data = data["ollama"]
-            for key, value in ollama_data.items():
-                if hasattr(self.config.ollama, key):
-                    setattr(self.config.ollama, key, value)
-
-        if "extraction" in data:
-            extraction_data = data["extraction"]
-            for key, value in extraction_data.items():
-                if hasattr(self.config.extraction, key):
-                    setattr(self.config.extraction, key, value)
-
-        if "knowledge" in data:
-            knowledge_data = data["knowledge"]
-            for key, value in knowledge_data.items():
-                if hasattr(self.config.knowledge, key):
-                    setattr(self.config.knowledge, key, value)
+        for section in ("ollama", "extraction", "knowledge"):
+            section_data = data.get(section)
+            if isinstance(section_data, dict):
+                _apply(getattr(self.config, section), section_data)
 
     def _load_from_environment(self) -> None:
         """Load configuration from environment variables."""
-        # Ollama settings
-        base_url = os.getenv("SCIXTRACT_OLLAMA_BASE_URL")
-        if base_url:
-            self.config.ollama.base_url = base_url
-        model = os.getenv("SCIXTRACT_OLLAMA_MODEL")
-        if model:
-            self.config.ollama.model = model
-        timeout_str = os.getenv("SCIXTRACT_OLLAMA_TIMEOUT")
-        if timeout_str:
+        for name, section, field_name, caster in _ENV_MAP:
+            value = os.environ.get(name)
+            if not value:
+                continue
             try:
-                self.config.ollama.timeout = int(timeout_str)
+                setattr(getattr(self.config, section), field_name, caster(value))
             except ValueError:
                 pass
-        temperature_str = os.getenv("SCIXTRACT_OLLAMA_TEMPERATURE")
-        if temperature_str:
-            try:
-                self.config.ollama.temperature = float(temperature_str)
-            except ValueError:
-                pass
-
-        # Extraction settings
-        output_dir = os.getenv("SCIXTRACT_OUTPUT_DIR")
-        if output_dir:
-            self.config.extraction.output_dir = output_dir
-        update_knowledge = os.getenv("SCIXTRACT_UPDATE_KNOWLEDGE")
-        if update_knowledge:
-            self.config.extraction.update_knowledge = update_knowledge.lower() in [
-                "true",
-                "1",
-                "yes",
-            ]
-
-        # Knowledge settings
-        db_path = os.getenv("SCIXTRACT_KNOWLEDGE_DB_PATH")
-        if db_path:
-            self.config.knowledge.db_path = db_path
 
     def save_config(self, path: Optional[str] = None) -> None:
         """Save current configuration to TOML file."""
@@ -217,63 +224,52 @@ export_format = "json"
         else:
             output_path = Path("scixtract.toml")
 
-        # Convert config to dictionary
+        # Convert config to dictionary (sections hold only flat primitives);
+        # TOML has no null, so unset values are left out
         config_dict = {
-            "ollama": asdict(self.config.ollama),
-            "extraction": asdict(self.config.extraction),
-            "knowledge": asdict(self.config.knowledge),
+            name: {
+                key: value
+                for key, value in getattr(self.config, name).__dict__.items()
+                if value is not None
+            }
+            for name in ("ollama", "extraction", "knowledge")
         }
 
         # Create directory if needed
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        try:
-            import tomli_w
-
-            with open(output_path, "wb") as f:
-                tomli_w.dump(config_dict, f)
-            print(f"Configuration saved to: {output_path}")
-        except ImportError:
-            # Fallback to manual TOML writing
-            with open(output_path, "w") as f:
-                f.write("[ollama]\n")
-                for key, value in config_dict["ollama"].items():
-                    if isinstance(value, str):
-                        f.write(f'{key} = "{value}"\n')
-                    else:
-                        f.write(f"{key} = {value}\n")
-
-                f.write("\n[extraction]\n")
-                for key, value in config_dict["extraction"].items():
-                    if isinstance(value, str):
-                        f.write(f'{key} = "{value}"\n')
-                    else:
-                        f.write(f"{key} = {value}\n")
-
-                f.write("\n[knowledge]\n")
-                for key, value in config_dict["knowledge"].items():
-                    if value is not None:
-                        if isinstance(value, str):
-                            f.write(f'{key} = "{value}"\n')
-                        else:
-                            f.write(f"{key} = {value}\n")
-
-            print(f"Configuration saved to: {output_path}")
+        with open(output_path, "wb") as f:
+            tomli_w.dump(config_dict, f)
+        logger.info("Configuration saved to: %s", output_path)
 
 
-def get_config(config_path: Optional[str] = None) -> Config:
-    """Get configuration instance."""
-    manager = ConfigManager(config_path)
-    return manager.config
+@functools.lru_cache(maxsize=8)
+def _get_manager(config_path: Optional[str] = None) -> ConfigManager:
+    """Return a shared ConfigManager, loading each resolved path only once."""
+    return ConfigManager(config_path)
+
 
+def load_config_manager(config_path: Optional[str] = None) -> ConfigManager:
+    """Return the shared ConfigManager for a config file.
 
-# Global config instance
-_config_manager = None
+    Paths are resolved first, so relative and absolute spellings of the
+    same file share one manager.
+    """
+    if config_path:
+        config_path = str(Path(config_path).expanduser().resolve())
+    return _get_manager(config_path)
+
+
+def reset_config_cache() -> None:
+    """Forget cached configuration so the next access reloads it."""
+    _get_manager.cache_clear()
+
+
+def get_config(config_path: Optional[str] = None) -> Config:
+    """Get configuration instance."""
+    return load_config_manager(config_path).config
 
 
 def config() -> Config:
     """Get global config instance."""
-    global _config_manager
-    if _config_manager is None:
-        _config_manager = ConfigManager()
-    return _config_manager.config
+    return load_config_manager().config
@@ -2,13 +2,21 @@
 Advanced AI-powered PDF text extraction and processing.
 """
 
+import hashlib
 import json
+import os
+import random
+import re
+import threading
 import time
 import warnings
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeGuard
 
 import requests
+from requests.adapters import HTTPAdapter
 
 try:
     # Suppress PyMuPDF/SWIG deprecation warnings during import
@@ -24,6 +32,13 @@ try:
 except ImportError:
     HAS_PYMUPDF = False
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 try:
     import bibtexparser
 
@@ -31,24 +46,539 @@ try:
 except ImportError:
     HAS_BIBTEXPARSER = False
 
+from .cache import cache_dir, read_json, write_json
 from .models import DocumentMetadata, ExtractionResult, PageContent
 
+# Successful availability probes are reused for this many seconds
+PROBE_CACHE_TTL = 24 * 60 * 60
+
+# Bump whenever prompts or the result layout change so cached results expire
+RESULT_CACHE_VERSION = 4
+
+# How long Ollama keeps the model, and its prompt cache, loaded between calls
+OLLAMA_KEEP_ALIVE = "30m"
+
+# Bump to invalidate every Ollama response cached on disk
+RESPONSE_CACHE_VERSION = 1
+
+CONTENT_TYPES = (
+    "abstract",
+    "introduction",
+    "methods",
+    "results",
+    "discussion",
+    "conclusion",
+    "references",
+    "appendix",
+    "main",
+    "blank",  # Assigned by _cheap_classify, never asked of the model
+)
+
+# A backend failing this many requests in a row is skipped for the cooldown
+CIRCUIT_BREAKER_THRESHOLD = 5
+CIRCUIT_BREAKER_COOLDOWN = 30.0
+
+# Transient failures are retried with exponential backoff plus jitter
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Characters of page text included in a per-page prompt; fits num_ctx=4096
+MAX_PAGE_PROMPT_CHARS = 8000
+
+# Characters read by extract_keywords_and_concepts
+KEYWORD_TEXT_CHARS = 4000
+
+# Characters of document text sampled for generate_summary
+SUMMARY_SAMPLE_CHARS = 3000
+
+# Generation caps for short answers; the keyword JSON rarely needs half of
+# its cap, and a page label is a single word
+KEYWORD_NUM_PREDICT = 512
+CLASSIFY_NUM_PREDICT = 8
+
+# Documents with fewer pages are extracted in-process; below this the cost
+# of starting worker processes outweighs the parallel speedup
+PARALLEL_EXTRACT_MIN_PAGES = 32
+
+_CONTENT_TYPE_GUIDE = """\
+- abstract: Abstract or summary section
+- introduction: Introduction or background
+- methods: Methodology, experimental procedures, materials
+- results: Results, data, findings, analysis
+- discussion: Discussion, interpretation, comparison
+- conclusion: Conclusions, summary, future work
+- references: Reference list, bibliography
+- appendix: Supplementary material, appendices
+- main: General main content that doesn't fit other categories"""
+
+# System prompts are sent byte-for-byte the same on every call so Ollama can
+# reuse the cached prompt prefix
+_KEYWORD_SYSTEM_PROMPT = (
+    "You are an expert academic researcher specializing in analyzing "
+    "scientific papers. Your task is to extract keywords and key "
+    "concepts from academic text with high precision."
+)
+_CLASSIFY_SYSTEM_PROMPT = (
+    "You are an expert at analyzing academic paper structure. "
+    "Classify the content type of each page section."
+)
+_ANALYZE_SYSTEM_PROMPT = (
+    "You are an expert academic researcher. Classify pages of "
+    "scientific papers and extract their structured information."
+)
+_SPACING_SYSTEM_PROMPT = (
+    "You are a text processing expert. Fix spacing, formatting, and "
+    "readability issues in academic text extracted from PDFs."
+)
+_BATCH_SYSTEM_PROMPT = (
+    "You are an expert academic researcher specializing in analyzing "
+    "scientific papers. Extract structured information from each page "
+    "and respond with valid JSON only."
+)
+_SUMMARY_SYSTEM_PROMPT = (
+    "You are an expert academic researcher. Create comprehensive "
+    "summaries of scientific papers."
+)
+
+_STRUCTURED_SYSTEM_PROMPTS = {
+    content_type: (
+        f"You are an expert academic researcher. Extract structured "
+        f"information from {content_type} sections of scientific papers."
+    )
+    for content_type in CONTENT_TYPES
+}
+
+_ANALYZE_PAGE_INSTRUCTIONS = f"""Analyze the page from an academic paper given \
+at the end.
+
+Classify the page as ONE of these types:
+{_CONTENT_TYPE_GUIDE}
+
+Then extract its key information. Use these fields for the structured object:
+- abstract: objective, methods, findings, significance
+- methods: materials, equipment, procedures, conditions
+- results: key_findings, data_types, measurements, performance
+- any other type: main_points, key_terms, important_info
+
+Return JSON with:
+{{
+    "content_type": "type",
+    "structured": {{"field": "value"}}
+}}"""
+
+UNIFIED_EXTRACTION_PROMPT = """Analyze these pages from an academic paper with \
+{total_pages} pages. Pages are separated by "///".
+
+{pages}
+
+For EACH page, extract:
+1. keywords: specific technical terms, methods, materials, equipment
+2. concepts: broader research concepts and themes
+3. content_type: ONE of abstract, introduction, methods, results, discussion,
+   conclusion, references, appendix, main
+4. structured: the most important information on the page as a JSON object
+
+Return ONLY a JSON object with this exact structure:
+{{
+    "pages": [
+        {{
+            "page": 1,
+            "keywords": ["keyword1", "keyword2"],
+            "concepts": ["concept1", "concept2"],
+            "content_type": "main",
+            "structured": {{"main_points": ["point1"], "important_info": "info"}}
+        }}
+    ]
+}}
+
+Return one entry per page, using the page numbers given above."""
+
+# Per-call prompt templates, filled in with str.format
+_KEYWORD_PROMPT = """Analyze this academic text and extract:
+
+1. TECHNICAL KEYWORDS: Specific technical terms, methods, materials, equipment
+2. RESEARCH CONCEPTS: Broader research concepts and themes
+3. CHEMICAL COMPOUNDS: All chemical formulas and compound names
+4. METHODOLOGIES: Research methods and analytical techniques
+5. EQUIPMENT: Instruments and analytical equipment mentioned
+
+Text to analyze:
+{text}
+
+Return ONLY a JSON object with this exact structure:
+{{
+    "technical_keywords": ["keyword1", "keyword2"],
+    "research_concepts": ["concept1", "concept2"],
+    "chemical_compounds": ["compound1", "compound2"],
+    "methodologies": ["method1", "method2"],
+    "equipment": ["instrument1", "instrument2"]
+}}
+
+Be precise and avoid duplicates. Focus on the most important and specific terms."""
+
+_CLASSIFY_PROMPT = f"""Classify this text from page {{page_num}} of \
+{{total_pages}} pages.
+
+Text:
+{{text}}
+
+Classify as ONE of these types:
+{_CONTENT_TYPE_GUIDE}
+
+Return only the classification word, nothing else."""
+
+_SPACING_PROMPT = """Fix spacing and formatting issues in this academic text:
+
+RULES:
+1. Add spaces between words incorrectly joined together
+2. Fix broken words across lines (remove hyphens, join parts)
+3. Preserve chemical formulas (NOx, NH3, etc.) exactly
+4. Preserve citations and references exactly
+5. Fix punctuation spacing
+6. Maintain paragraph structure
+7. Do NOT change technical terms or add new content
+
+Text to fix:
+{text}
+
+Return only the corrected text with no explanations."""
+
+_SUMMARY_PROMPT = """Create a comprehensive summary of this research paper:
+
+PAPER METADATA:
+- Title: {title}
+- Authors: {authors}
+- Year: {year}
+- Keywords: {keywords}
+
+CONTENT SAMPLE:
+{sample}
+
+Create a structured summary with:
+
+## Research Overview
+[Brief overview of the research topic and objectives]
+
+## Methodology
+[Key methods and approaches used]
+
+## Main Findings
+[Primary results and discoveries]
+
+## Significance
+[Research significance and implications]
+
+## Key Technical Details
+[Important technical information, equipment, conditions]
+
+## Relevance to NOx/Ammonia Research
+[How this relates to NOx to ammonia conversion research, if applicable]
+
+Keep the summary concise but comprehensive (300-500 words)."""
+
+# Text cleanup applied before the LLM spacing pass
+_RE_HYPHEN_BREAK = re.compile(r"(?<=[A-Za-z])-\n(?=[a-z])")
+_RE_PUNCT_JOINED = re.compile(r"(?<=[a-z][.,;:])(?=[A-Z][a-z])")
+_RE_MULTI_WS = re.compile(r"[ \t\f\v]+")
+_RE_MULTI_NEWLINE = re.compile(r"\n\s*\n\s*\n+")
+# Removes BibTeX grouping braces in a single pass
+_BRACE_STRIP = str.maketrans("", "", "{}")
+
+# Long all-lowercase runs are usually several words glued together
+_RE_JOINED_WORD = re.compile(r"\b[a-z]{16,}\b")
+
+# Reference lists are recognised by parenthesised years and DOIs
+_RE_REF_YEAR = re.compile(r"\((?:19|20)\d{2}[a-z]?\)")
+_RE_DOI = re.compile(r"\b10\.\d{4,9}/\S+")
+REFERENCE_MARKER_THRESHOLD = 8
+
+# Pages with less text than this are treated as blank or figure-only
+BLANK_PAGE_CHARS = 200
+
+# Share of joined-looking words above which the LLM spacing pass runs
+JOINED_WORD_THRESHOLD = 0.05
+
+
+def _regex_clean(text: str) -> str:
+    """Cheap spacing fixes that do not need the LLM.
+
+    Joins words hyphenated across lines, adds the missing space after
+    sentence punctuation and collapses runs of whitespace. Case changes
+    inside words are left alone so formulas such as ``pH`` or ``NOx``
+    survive.
+    """
+    text = _RE_HYPHEN_BREAK.sub("", text)
+    text = _RE_PUNCT_JOINED.sub(" ", text)
+    text = _RE_MULTI_WS.sub(" ", text)
+    text = _RE_MULTI_NEWLINE.sub("\n\n", text)
+    return text.strip()
+
+
+def _joined_word_ratio(text: str) -> float:
+    """Return the fraction of words that look like several joined words."""
+    words = text.split()
+    if not words:
+        return 0.0
+    return len(_RE_JOINED_WORD.findall(text)) / len(words)
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON model output, using orjson when available.
+
+    Raises ``json.JSONDecodeError`` on invalid input either way.
+    """
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _merge_keyword_results(
+    results: Iterable[Dict[str, Any]], limit: int = 20
+) -> Dict[str, List[str]]:
+    """Merge per-page keyword extractions into one ranked result.
+
+    Terms are deduplicated case-insensitively, keeping the first spelling
+    seen, and ranked by how many pages mention them. Each category keeps
+    at most ``limit`` terms.
+    """
+    counts: Dict[str, Counter[str]] = {}
+    spellings: Dict[str, Dict[str, str]] = {}
+    for result in results:
+        for category, terms in result.items():
+            if not isinstance(terms, list):
+                continue
+            category_counts = counts.setdefault(category, Counter())
+            category_spellings = spellings.setdefault(category, {})
+            page_terms = {str(t).strip().lower(): str(t).strip() for t in terms if t}
+            for key, term in page_terms.items():
+                category_spellings.setdefault(key, term)
+                category_counts[key] += 1
+
+    return {
+        category: [
+            spellings[category][key] for key, _ in category_counts.most_common(limit)
+        ]
+        for category, category_counts in counts.items()
+    }
+
+
+def _bounded_join(texts: Iterable[str], limit: int, sep: str = " ") -> str:
+    """Return ``sep.join(texts)[:limit]`` without building the full string."""
+    parts: List[str] = []
+    remaining = limit
+    for text in texts:
+        if parts:
+            parts.append(sep[:remaining])
+            remaining -= len(parts[-1])
+        if remaining <= 0:
+            break
+        parts.append(text[:remaining])
+        remaining -= len(parts[-1])
+    return "".join(parts)
+
+
+def _keyword_context(keywords: List[str]) -> str:
+    """Return the prompt line naming the document's top keywords."""
+    return f"Key terms to focus on: {', '.join(keywords[:10])}" if keywords else ""
+
+
+def _content_type(label: Any) -> str:
+    """Normalise a model's page label, filing unknown labels under main."""
+    content_type = str(label or "").lower().strip()
+    return content_type if content_type in CONTENT_TYPES else "main"
+
+
+def _cheap_classify(text: str) -> Optional[str]:
+    """Label pages that need no LLM call, or return None.
+
+    Returns ``"blank"`` for pages with almost no text (figures, separators)
+    and ``"references"`` for pages dense with citation years or DOIs.
+    """
+    if len(text.strip()) < BLANK_PAGE_CHARS:
+        return "blank"
+    markers = len(_RE_REF_YEAR.findall(text)) + len(_RE_DOI.findall(text))
+    if markers > REFERENCE_MARKER_THRESHOLD:
+        return "references"
+    return None
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages ``start`` to ``stop`` in a worker process."""
+    with fitz.open(pdf_path) as doc:
+        return [doc.load_page(i).get_text("text") for i in range(start, stop)]
+
+
+class OllamaError(RuntimeError):
+    """Raised when Ollama cannot be reached or returns an error."""
+
+
+def _parse_hosts(hosts: str) -> List[str]:
+    """Turn ``host1:11434,host2:11434`` into a list of base URLs."""
+    urls = []
+    for host in hosts.split(","):
+        host = host.strip().rstrip("/")
+        if host:
+            urls.append(host if "://" in host else f"http://{host}")
+    return urls
+
 
 class OllamaAIProcessor:
     """Advanced AI processor using Ollama with sophisticated prompting."""
 
     def __init__(
-        self, model: str = "qwen2.5:7b", base_url: str = "http://localhost:11434"
+        self,
+        model: str = "qwen2.5:7b",
+        base_url: str = "http://localhost:11434",
+        cache_size: int = 4096,
+        disk_cache: bool = True,
+        base_urls: Optional[List[str]] = None,
+        cache_ttl: Optional[float] = None,
     ):
         self.model = model
-        self.base_url = base_url
-        self.available = self._check_availability()
+        # Several Ollama servers can share the load, from base_urls or the
+        # comma-separated OLLAMA_HOSTS environment variable
+        if not base_urls:
+            base_urls = _parse_hosts(os.getenv("OLLAMA_HOSTS", "")) or [base_url]
+        self.base_urls = list(base_urls)
+        self._inflight: Dict[str, int] = {}
+        self._retry_after: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self.max_retries = MAX_RETRIES
+        self._next_backend = 0
+        self._backend_lock = threading.Lock()
+        self._warmed = False
+        # Keep-alive session so repeated calls reuse pooled connections,
+        # sized for concurrent page processing
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self.available = self._probe_once()
         self.conversation_history: List[Dict[str, str]] = []
+        # LRU cache of responses keyed by a hash of the request payload
+        self.cache_size = cache_size
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Responses are also persisted under the cache directory across runs,
+        # for cache_ttl seconds or indefinitely if it is None
+        self.disk_cache = disk_cache
+        self.cache_ttl = cache_ttl
+
+    @property
+    def base_url(self) -> str:
+        """The first configured backend; setting it replaces all backends.
+
+        Replacing the backends resets their health and probes them again,
+        so availability always describes the servers requests go to.
+        """
+        return self.base_urls[0]
+
+    @base_url.setter
+    def base_url(self, value: str) -> None:
+        with self._backend_lock:
+            self.base_urls = [value]
+            self._inflight.clear()
+            self._retry_after.clear()
+            self._failures.clear()
+        self.available = self._probe_once()
+
+    def _acquire_backend(self) -> str:
+        """Pick the healthy backend with the fewest requests in flight.
+
+        Ties are broken round-robin so idle backends share sequential calls.
+        """
+        with self._backend_lock:
+            now = time.time()
+            count = len(self.base_urls)
+            start = self._next_backend % count
+            self._next_backend = start + 1
+            ordered = self.base_urls[start:] + self.base_urls[:start]
+            healthy = [
+                url for url in ordered if self._retry_after.get(url, 0.0) <= now
+            ] or ordered
+            url = min(healthy, key=lambda u: self._inflight.get(u, 0))
+            self._inflight[url] = self._inflight.get(url, 0) + 1
+            return url
+
+    def _release_backend(self, url: str, failed: bool = False) -> None:
+        """Finish a request, opening the circuit after repeated failures."""
+        with self._backend_lock:
+            self._inflight[url] = max(0, self._inflight.get(url, 0) - 1)
+            if failed:
+                self._failures[url] = self._failures.get(url, 0) + 1
+                if self._failures[url] >= CIRCUIT_BREAKER_THRESHOLD:
+                    self._retry_after[url] = time.time() + CIRCUIT_BREAKER_COOLDOWN
+            else:
+                self._failures.pop(url, None)
+                self._retry_after.pop(url, None)
+
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> "OllamaAIProcessor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _probe_once(self) -> bool:
+        """Check availability, reusing a recent successful probe from disk.
+
+        Only positive results are cached, so a server that was down is
+        probed again on the next run.
+        """
+        probe_file, probe_key = self._probe_location()
+
+        probes = read_json(probe_file)
+        if not isinstance(probes, dict):
+            probes = {}
+
+        entry = probes.get(probe_key)
+        if isinstance(entry, dict) and entry.get("available") is True:
+            try:
+                age = time.time() - float(entry.get("timestamp", 0))
+            except (TypeError, ValueError):
+                age = -1.0  # Damaged entry; probe again
+            if 0 <= age < PROBE_CACHE_TTL:
+                return True
+
+        available = self._check_availability()
+        if available:
+            probes[probe_key] = {"available": True, "timestamp": time.time()}
+            write_json(probe_file, probes)
+        return available
+
+    def _probe_location(self) -> Tuple[Path, str]:
+        """Return the probe cache file and this processor's key in it."""
+        return cache_dir() / "ollama-probe.json", (
+            f"{','.join(self.base_urls)}|{self.model}"
+        )
+
+    def _forget_probe(self) -> None:
+        """Drop the cached probe so the next processor checks Ollama live."""
+        probe_file, probe_key = self._probe_location()
+        probes = read_json(probe_file)
+        if isinstance(probes, dict) and probes.pop(probe_key, None) is not None:
+            write_json(probe_file, probes)
 
     def _check_availability(self) -> bool:
-        """Check if Ollama is available and model exists."""
+        """Check if any Ollama backend is available and has the model."""
+        available = False
+        for url in self.base_urls:
+            if self._check_backend(url):
+                available = True
+            else:
+                self._failures[url] = CIRCUIT_BREAKER_THRESHOLD
+                self._retry_after[url] = time.time() + CIRCUIT_BREAKER_COOLDOWN
+        return available
+
+    def _check_backend(self, url: str) -> bool:
+        """Check if one Ollama server is reachable and has the model."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self._session.get(f"{url}/api/tags", timeout=5)
             if response.status_code == 200:
                 models = response.json().get("models", [])
                 available_models = [m["name"] for m in models]
@@ -65,73 +595,183 @@ class OllamaAIProcessor:
         return False
 
     def _call_ollama(
-        self, prompt: str, system_prompt: str = "", temperature: float = 0.1
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.1,
+        json_mode: bool = False,
+        num_ctx: int = 8192,
+        num_predict: Optional[int] = None,
     ) -> str:
-        """Call Ollama API with error handling."""
-        if not self.available:
-            raise RuntimeError("Ollama not available")
+        """Call Ollama API, answering repeated prompts from the cache.
 
+        Short prompts should pass a smaller ``num_ctx`` so Ollama allocates
+        less KV cache per request, and short answers a ``num_predict`` cap
+        so a rambling model stops early. Raises ``OllamaError`` if the
+        request still fails after retrying.
+        """
+        if not self.available:
+            raise OllamaError("Ollama not available")
+
+        payload: Dict[str, Any] = {
+            "model": self.model,
+            "prompt": prompt,
+            "system": system_prompt,
+            "stream": False,
+            "options": {
+                "temperature": temperature,
+                "top_p": 0.9,
+                "num_ctx": num_ctx,
+            },
+        }
+        if num_predict is not None:
+            payload["options"]["num_predict"] = num_predict
+        if json_mode:
+            payload["format"] = "json"
+
+        cache_key = self._cache_key(payload)
+        # Does not affect the response, so it is kept out of the cache key
+        payload["keep_alive"] = OLLAMA_KEEP_ALIVE
+        with self._cache_lock:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                return cached
+
+        if self.disk_cache:
+            entry = read_json(self._disk_cache_path(cache_key))
+            if self._disk_entry_fresh(entry):
+                text = str(entry["response"])
+                self._cache_response(cache_key, text)
+                return text
+
+        text = self._generate(payload)
+        if text:
+            self._cache_response(cache_key, text)
+            if self.disk_cache:
+                write_json(
+                    self._disk_cache_path(cache_key),
+                    {"response": text, "timestamp": time.time()},
+                )
+        return text
+
+    def _generate(self, payload: Dict[str, Any]) -> str:
+        """POST a generate request, retrying transient failures."""
+        attempts = max(1, self.max_retries)
+        last_error: Optional[Exception] = None
+
+        for attempt in range(attempts):
+            if attempt:
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                time.sleep(delay + random.uniform(0, RETRY_BASE_DELAY))
+
+            url = self._acquire_backend()
+            try:
+                response = self._session.post(
+                    f"{url}/api/generate", json=payload, timeout=120
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._release_backend(url, failed=True)
+                last_error = e
+                continue
+            except requests.RequestException as e:
+                self._release_backend(url, failed=True)
+                raise OllamaError(f"Ollama request failed: {e}") from e
+
+            if response.status_code in RETRY_STATUS_CODES:
+                self._release_backend(url, failed=True)
+                last_error = OllamaError(f"Ollama returned HTTP {response.status_code}")
+                continue
+
+            self._release_backend(url, failed=response.status_code >= 500)
+            if response.status_code != 200:
+                raise OllamaError(f"Ollama returned HTTP {response.status_code}")
+
+            try:
+                response_text = response.json().get("response", "")
+            except (ValueError, AttributeError) as e:
+                raise OllamaError(f"Invalid response from Ollama: {e}") from e
+            return str(response_text).strip() if response_text else ""
+
+        if isinstance(last_error, (requests.ConnectionError, requests.Timeout)):
+            # No backend could be reached; a cached probe is no longer true
+            self._forget_probe()
+        raise OllamaError(
+            f"Ollama request failed after {attempts} attempts: {last_error}"
+        ) from last_error
+
+    def warm_up(self) -> bool:
+        """Ask every backend to load the model ahead of the first prompt.
+
+        Only the first call per processor does anything. Returns True if
+        any backend loaded the model.
+        """
+        with self._backend_lock:
+            if self._warmed or not self.available:
+                return False
+            self._warmed = True
+
+        loaded = False
+        for url in self.base_urls:
+            try:
+                response = self._session.post(
+                    f"{url}/api/generate",
+                    json={"model": self.model, "keep_alive": OLLAMA_KEEP_ALIVE},
+                    timeout=120,
+                )
+                loaded = loaded or response.status_code == 200
+            except Exception:
+                pass
+        return loaded
+
+    @staticmethod
+    def _cache_key(payload: Dict[str, Any]) -> str:
+        """Hash a request payload into a response cache key."""
+        encoded = json.dumps([RESPONSE_CACHE_VERSION, payload], sort_keys=True)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _disk_entry_fresh(self, entry: Any) -> TypeGuard[Dict[str, Any]]:
+        """Check that a disk cache entry holds a response within the TTL."""
+        if not isinstance(entry, dict) or not entry.get("response"):
+            return False
+        if self.cache_ttl is None:
+            return True
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "system": system_prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "top_p": 0.9,
-                    "num_ctx": 8192,
-                },
-            }
-
-            response = requests.post(
-                f"{self.base_url}/api/generate", json=payload, timeout=120
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                response_text = result.get("response", "")
-                return str(response_text).strip() if response_text else ""
-            else:
-                return ""
-
-        except Exception:
-            return ""
+            age = time.time() - float(entry.get("timestamp", 0))
+        except (TypeError, ValueError):
+            return False
+        return 0 <= age < self.cache_ttl
+
+    @staticmethod
+    def _disk_cache_path(cache_key: str) -> Path:
+        """Return the on-disk location of a cached response."""
+        return cache_dir() / "ollama" / cache_key[:2] / f"{cache_key}.json"
+
+    def _cache_response(self, cache_key: str, text: str) -> None:
+        """Store a response, evicting the least recently used entries."""
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._response_cache[cache_key] = text
+            self._response_cache.move_to_end(cache_key)
+            while len(self._response_cache) > self.cache_size:
+                self._response_cache.popitem(last=False)
 
     def extract_keywords_and_concepts(self, text: str) -> Dict[str, List[str]]:
         """First pass: Extract keywords and key concepts."""
-        system_prompt = (
-            "You are an expert academic researcher specializing in analyzing "
-            "scientific papers. Your task is to extract keywords and key "
-            "concepts from academic text with high precision."
+        prompt = _KEYWORD_PROMPT.format(text=text[:KEYWORD_TEXT_CHARS])
+
+        response = self._call_ollama(
+            prompt,
+            _KEYWORD_SYSTEM_PROMPT,
+            temperature=0.1,
+            json_mode=True,
+            num_ctx=2048,
+            num_predict=KEYWORD_NUM_PREDICT,
         )
 
-        prompt = f"""Analyze this academic text and extract:
-
-1. TECHNICAL KEYWORDS: Specific technical terms, methods, materials, equipment
-2. RESEARCH CONCEPTS: Broader research concepts and themes
-3. CHEMICAL COMPOUNDS: All chemical formulas and compound names
-4. METHODOLOGIES: Research methods and analytical techniques
-5. EQUIPMENT: Instruments and analytical equipment mentioned
-
-Text to analyze:
-{text[:4000]}
-
-Return ONLY a JSON object with this exact structure:
-{{
-    "technical_keywords": ["keyword1", "keyword2"],
-    "research_concepts": ["concept1", "concept2"],
-    "chemical_compounds": ["compound1", "compound2"],
-    "methodologies": ["method1", "method2"],
-    "equipment": ["instrument1", "instrument2"]
-}}
-
-Be precise and avoid duplicates. Focus on the most important and specific terms."""
-
-        response = self._call_ollama(prompt, system_prompt, temperature=0.1)
-
         try:
-            result = json.loads(response)
+            result = _json_loads(response)
             if isinstance(result, dict):
                 return result
             return {"keywords": [], "concepts": []}
@@ -146,44 +786,39 @@ Be precise and avoid duplicates. Focus on the most important and specific terms.
 
     def classify_content_type(self, text: str, page_num: int, total_pages: int) -> str:
         """Classify the type of content on a page."""
-        system_prompt = (
-            "You are an expert at analyzing academic paper structure. "
-            "Classify the content type of each page section."
+        prompt = _CLASSIFY_PROMPT.format(
+            page_num=page_num, total_pages=total_pages, text=text[:2000]
         )
 
-        prompt = f"""Classify this text from page {page_num} of {total_pages} pages.
-
-Text:
-{text[:2000]}
-
-Classify as ONE of these types:
-- abstract: Abstract or summary section
-- introduction: Introduction or background
-- methods: Methodology, experimental procedures, materials
-- results: Results, data, findings, analysis
-- discussion: Discussion, interpretation, comparison
-- conclusion: Conclusions, summary, future work
-- references: Reference list, bibliography
-- appendix: Supplementary material, appendices
-- main: General main content that doesn't fit other categories
-
-Return only the classification word, nothing else."""
-
-        response = self._call_ollama(prompt, system_prompt, temperature=0.1)
-        return response.lower().strip() if response else "main"
+        response = self._call_ollama(
+            prompt,
+            _CLASSIFY_SYSTEM_PROMPT,
+            temperature=0.1,
+            num_ctx=2048,
+            num_predict=CLASSIFY_NUM_PREDICT,
+        )
+        return _content_type(response)
 
     def extract_structured_content(
-        self, text: str, content_type: str, keywords: List[str]
+        self,
+        text: str,
+        content_type: str,
+        keywords: List[str],
+        keyword_context: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Extract structured content based on content type."""
-        system_prompt = (
+        """Extract structured content based on content type.
+
+        ``keyword_context`` may be precomputed with ``_keyword_context`` when
+        the same keywords are used for every page.
+        """
+        system_prompt = _STRUCTURED_SYSTEM_PROMPTS.get(content_type) or (
             f"You are an expert academic researcher. Extract structured "
             f"information from {content_type} sections of scientific papers."
         )
 
-        keyword_context = (
-            f"Key terms to focus on: {', '.join(keywords[:10])}" if keywords else ""
-        )
+        if keyword_context is None:
+            keyword_context = _keyword_context(keywords)
+        text = text[:MAX_PAGE_PROMPT_CHARS]
 
         if content_type == "abstract":
             prompt = f"""Extract structured information from this abstract:
@@ -244,98 +879,269 @@ Return JSON with:
     "important_info": "most important information"
 }}"""
 
-        response = self._call_ollama(prompt, system_prompt, temperature=0.1)
+        response = self._call_ollama(
+            prompt, system_prompt, temperature=0.1, json_mode=True, num_ctx=4096
+        )
 
         try:
-            result = json.loads(response)
+            result = _json_loads(response)
             if isinstance(result, dict):
                 return result
             return {"extraction_error": "Invalid response format"}
         except json.JSONDecodeError:
             return {"extraction_error": "Could not parse structured content"}
 
-    def fix_text_spacing(self, text: str) -> str:
-        """Fix spacing and formatting issues in extracted text."""
-        system_prompt = (
-            "You are a text processing expert. Fix spacing, formatting, and "
-            "readability issues in academic text extracted from PDFs."
-        )
+    def analyze_page(
+        self,
+        text: str,
+        page_num: int,
+        total_pages: int,
+        keywords: List[str],
+        keyword_context: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Fix spacing, classify and extract structure for one page.
 
-        prompt = f"""Fix spacing and formatting issues in this academic text:
+        Classification and structured extraction share a single Ollama call.
+        If the response cannot be parsed, the per-step methods are used
+        instead. Returns ``content_type``, ``processed_text`` and
+        ``structured``.
+        """
+        processed_text = self.fix_text_spacing(text)
 
-RULES:
-1. Add spaces between words incorrectly joined together
-2. Fix broken words across lines (remove hyphens, join parts)
-3. Preserve chemical formulas (NOx, NH3, etc.) exactly
-4. Preserve citations and references exactly
-5. Fix punctuation spacing
-6. Maintain paragraph structure
-7. Do NOT change technical terms or add new content
+        if keyword_context is None:
+            keyword_context = _keyword_context(keywords)
 
-Text to fix:
-{text}
+        # Fixed instructions first and the page last, so consecutive pages
+        # share as long a prompt prefix as possible
+        prompt = f"""{_ANALYZE_PAGE_INSTRUCTIONS}
 
-Return only the corrected text with no explanations."""
+{keyword_context}
 
-        response = self._call_ollama(prompt, system_prompt, temperature=0.1)
-        return response if response else text
+Page {page_num} of {total_pages}:
+{processed_text[:MAX_PAGE_PROMPT_CHARS]}"""
 
-    def generate_summary(self, extraction_result: ExtractionResult) -> str:
-        """Generate a comprehensive summary of the document."""
-        system_prompt = (
-            "You are an expert academic researcher. Create comprehensive "
-            "summaries of scientific papers."
+        response = self._call_ollama(
+            prompt,
+            _ANALYZE_SYSTEM_PROMPT,
+            temperature=0.1,
+            json_mode=True,
+            num_ctx=4096,
         )
 
-        # Prepare context
-        metadata = extraction_result.metadata
-        all_text = " ".join(
-            [page.processed_text for page in extraction_result.pages[:5]]
-        )  # First 5 pages
+        parsed: Any = None
+        try:
+            parsed = _json_loads(response) if response else None
+        except json.JSONDecodeError:
+            pass
 
-        prompt = f"""Create a comprehensive summary of this research paper:
+        content_type = ""
+        structured: Any = None
+        if isinstance(parsed, dict):
+            content_type = str(parsed.get("content_type") or "").lower().strip()
+            structured = parsed.get("structured")
 
-PAPER METADATA:
-- Title: {metadata.title}
-- Authors: {', '.join(metadata.authors)}
-- Year: {metadata.year}
-- Keywords: {', '.join(metadata.keywords)}
+        if content_type not in CONTENT_TYPES:
+            content_type = self.classify_content_type(
+                processed_text, page_num, total_pages
+            )
+        if not isinstance(structured, dict):
+            structured = self.extract_structured_content(
+                processed_text, content_type, keywords, keyword_context
+            )
 
-CONTENT SAMPLE:
-{all_text[:3000]}
+        return {
+            "content_type": content_type,
+            "processed_text": processed_text,
+            "structured": structured,
+        }
 
-Create a structured summary with:
+    def fix_text_spacing(self, text: str, force: bool = False) -> str:
+        """Fix spacing and formatting issues in extracted text.
 
-## Research Overview
-[Brief overview of the research topic and objectives]
+        The regex pass handles most pages; the LLM is only asked when many
+        words still look joined together, or when ``force`` is set.
+        """
+        text = _regex_clean(text)
+        if not text:
+            return text
+        if not force and _joined_word_ratio(text) <= JOINED_WORD_THRESHOLD:
+            return text
 
-## Methodology
-[Key methods and approaches used]
+        prompt = _SPACING_PROMPT.format(text=text)
 
-## Main Findings
-[Primary results and discoveries]
+        response = self._call_ollama(prompt, _SPACING_SYSTEM_PROMPT, temperature=0.1)
+        return response if response else text
 
-## Significance
-[Research significance and implications]
+    def analyze_pages(
+        self, pages: List[PageContent], total_pages: int
+    ) -> Dict[int, Dict[str, Any]]:
+        """Extract keywords, concepts, content type and structure for several
+        pages in a single call.
+
+        Returns the parsed entries keyed by page number. Pages missing from
+        the response are absent from the result.
+        """
+        page_blocks = "\n///\n".join(
+            f"PAGE {page.page_num}:\n{page.raw_text[:3000]}" for page in pages
+        )
+        prompt = UNIFIED_EXTRACTION_PROMPT.format(
+            total_pages=total_pages, pages=page_blocks
+        )
 
-## Key Technical Details
-[Important technical information, equipment, conditions]
+        response = self._call_ollama(
+            prompt, _BATCH_SYSTEM_PROMPT, temperature=0.1, json_mode=True
+        )
 
-## Relevance to NOx/Ammonia Research
-[How this relates to NOx to ammonia conversion research, if applicable]
+        try:
+            result = _json_loads(response)
+        except json.JSONDecodeError:
+            return {}
 
-Keep the summary concise but comprehensive (300-500 words)."""
+        entries = result.get("pages", []) if isinstance(result, dict) else []
+        analyzed: Dict[int, Dict[str, Any]] = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                analyzed[int(entry.get("page", 0))] = entry
+            except (TypeError, ValueError):
+                continue
+        return analyzed
+
+    def generate_summary(self, extraction_result: ExtractionResult) -> str:
+        """Generate a comprehensive summary of the document."""
+        # Prepare context
+        metadata = extraction_result.metadata
+        all_text = _bounded_join(
+            (page.processed_text for page in extraction_result.pages[:5]),
+            SUMMARY_SAMPLE_CHARS,
+        )  # First 5 pages
 
-        response = self._call_ollama(prompt, system_prompt, temperature=0.2)
+        prompt = _SUMMARY_PROMPT.format(
+            title=metadata.title,
+            authors=", ".join(metadata.authors),
+            year=metadata.year,
+            keywords=", ".join(metadata.keywords),
+            sample=all_text,
+        )
+
+        response = self._call_ollama(prompt, _SUMMARY_SYSTEM_PROMPT, temperature=0.2)
         return response if response else "Summary generation failed"
 
 
 class AdvancedPDFProcessor:
     """Advanced PDF processor with AI enhancement and tracking."""
 
-    def __init__(self, model: str = "qwen2.5:7b", bib_file: Optional[Path] = None):
-        self.ai = OllamaAIProcessor(model)
+    def __init__(
+        self,
+        model: str = "qwen2.5:7b",
+        bib_file: Optional[Path] = None,
+        use_cache: bool = True,
+        max_workers: int = 4,
+        base_url: str = "http://localhost:11434",
+    ):
+        # OLLAMA_HOSTS, when set, takes precedence over base_url
+        self.ai = OllamaAIProcessor(model, base_url=base_url)
         self.bib_data = self._load_bibliography(bib_file) if bib_file else {}
+        self.use_cache = use_cache
+        # Pages processed concurrently; match Ollama's OLLAMA_NUM_PARALLEL
+        self.max_workers = max_workers
+
+    def _result_cache_path(
+        self, pdf_path: Path, metadata: DocumentMetadata, mode: str
+    ) -> Optional[Path]:
+        """Return the result cache file for a PDF, or None if caching is off.
+
+        The key covers the PDF contents, the model, the processing mode and
+        the bibliography metadata, so any of them changing forces a rerun.
+        """
+        if not self.use_cache:
+            return None
+
+        digest = hashlib.sha256()
+        try:
+            with open(pdf_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+
+        bib_fields = metadata.to_dict()
+        for volatile in (
+            "keywords",
+            "page_count",
+            "extraction_date",
+            "processing_time",
+        ):
+            bib_fields.pop(volatile, None)
+
+        key_data = [
+            RESULT_CACHE_VERSION,
+            mode,
+            self.ai.model,
+            digest.hexdigest(),
+            bib_fields,
+        ]
+        key = hashlib.sha256(
+            json.dumps(key_data, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        return cache_dir() / "results" / f"{key}.json"
+
+    @staticmethod
+    def _load_cached_result(cache_path: Optional[Path]) -> Optional[ExtractionResult]:
+        """Load a cached extraction result, ignoring missing or stale entries."""
+        if cache_path is None:
+            return None
+        data = read_json(cache_path)
+        if not isinstance(data, dict):
+            return None
+        try:
+            return ExtractionResult.from_dict(data)
+        except (KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _checkpoint_path(cache_path: Optional[Path]) -> Optional[Path]:
+        """Return the per-page checkpoint file matching a result cache file."""
+        if cache_path is None:
+            return None
+        return cache_dir() / "checkpoints" / f"{cache_path.stem}.jsonl"
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: Optional[Path]) -> Dict[int, Dict[str, Any]]:
+        """Load completed page analyses, skipping truncated or invalid lines."""
+        completed: Dict[int, Dict[str, Any]] = {}
+        if checkpoint_path is None:
+            return completed
+        try:
+            lines = checkpoint_path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return completed
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                page_num = int(entry.pop("page"))
+            except (ValueError, TypeError, KeyError, AttributeError):
+                continue
+            if {"content_type", "processed_text", "structured"} <= entry.keys():
+                completed[page_num] = entry
+        return completed
+
+    @staticmethod
+    def _append_checkpoint(
+        checkpoint_path: Path, page_num: int, analysis: Dict[str, Any]
+    ) -> None:
+        """Durably append one page analysis, ignoring filesystem errors."""
+        line = json.dumps({"page": page_num, **analysis}, ensure_ascii=False)
+        try:
+            checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(checkpoint_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError:
+            pass
 
     def _load_bibliography(self, bib_file: Path) -> Dict[str, Dict[str, Any]]:
         """Load bibliography data from BibTeX file."""
@@ -350,29 +1156,53 @@ class AdvancedPDFProcessor:
             print(f"Warning: Bibliography file not found: {bib_file}")
             return {}
 
+        # Parsed entries are cached on disk until the file changes
+        cache_path: Optional[Path] = None
+        signature = ""
+        try:
+            stat = bib_file.stat()
+            signature = f"{stat.st_mtime_ns}-{stat.st_size}"
+            path_hash = hashlib.sha256(
+                str(bib_file.resolve()).encode("utf-8")
+            ).hexdigest()
+            cache_path = cache_dir() / "bib" / f"{path_hash}.json"
+        except OSError:
+            pass
+
+        if cache_path is not None:
+            cached = read_json(cache_path)
+            if isinstance(cached, dict) and cached.get("signature") == signature:
+                cached_entries = cached.get("entries")
+                if isinstance(cached_entries, dict):
+                    return cached_entries
+
         try:
             with open(bib_file, "r", encoding="utf-8") as f:
                 bib_database = bibtexparser.load(f)
 
-            return {entry["ID"]: entry for entry in bib_database.entries}
+            entries = {entry["ID"]: entry for entry in bib_database.entries}
         except Exception as e:
             print(f"Warning: Could not load bibliography: {e}")
             return {}
 
+        if cache_path is not None:
+            write_json(cache_path, {"signature": signature, "entries": entries})
+        return entries
+
     def _get_metadata_from_bib(self, cite_key: str) -> DocumentMetadata:
         """Extract metadata from bibliography entry."""
         metadata = DocumentMetadata(cite_key=cite_key)
 
         if cite_key in self.bib_data:
             entry = self.bib_data[cite_key]
-            metadata.title = entry.get("title", "").replace("{", "").replace("}", "")
+            metadata.title = entry.get("title", "").translate(_BRACE_STRIP)
             metadata.year = entry.get("year", "")
-            metadata.journal = entry.get("journal", "")
+            metadata.journal = entry.get("journal", "").translate(_BRACE_STRIP)
             metadata.doi = entry.get("doi", "")
             metadata.url = entry.get("url", "")
 
             # Parse authors
-            authors_str = entry.get("author", "")
+            authors_str = entry.get("author", "").translate(_BRACE_STRIP)
             if authors_str:
                 # Simple author parsing (could be improved)
                 authors = [author.strip() for author in authors_str.split(" and ")]
@@ -380,6 +1210,15 @@ class AdvancedPDFProcessor:
 
         return metadata
 
+    def _iter_doc_pages(self, doc: Any) -> Iterator[PageContent]:
+        """Yield the pages of an open document, closing it when done."""
+        try:
+            for page_num in range(len(doc)):
+                text = doc.load_page(page_num).get_text("text")
+                yield PageContent(page_num=page_num + 1, raw_text=text)
+        finally:
+            doc.close()
+
     def extract_pdf_content(self, pdf_path: Path) -> List[PageContent]:
         """Extract content from PDF with layout analysis."""
         if not HAS_PYMUPDF:
@@ -389,62 +1228,122 @@ class AdvancedPDFProcessor:
 
         try:
             doc = fitz.open(pdf_path)
-            pages = []
+            page_count = len(doc)
+            workers = min(os.cpu_count() or 1, 4)
 
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-
-                # Extract text with better formatting
-                text = page.get_text("text")
-
-                # Create page content
-                page_content = PageContent(page_num=page_num + 1, raw_text=text)
-
-                pages.append(page_content)
+            if page_count < PARALLEL_EXTRACT_MIN_PAGES or workers < 2:
+                return list(self._iter_doc_pages(doc))
 
             doc.close()
-            return pages
+            texts = self._extract_pages_parallel(pdf_path, page_count, workers)
+            return [
+                PageContent(page_num=page_num + 1, raw_text=text)
+                for page_num, text in enumerate(texts)
+            ]
 
         except Exception as e:
             raise RuntimeError(f"PDF extraction failed: {e}")
 
+    def _extract_pages_parallel(
+        self, pdf_path: Path, page_count: int, workers: int
+    ) -> List[str]:
+        """Extract page text in worker processes, one contiguous range each."""
+        step = -(-page_count // workers)
+        starts = list(range(0, page_count, step))
+        stops = [min(start + step, page_count) for start in starts]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = executor.map(
+                _extract_page_range, [str(pdf_path)] * len(starts), starts, stops
+            )
+            return [text for chunk in chunks for text in chunk]
+
+    def _analyze_page(
+        self,
+        page: PageContent,
+        total_pages: int,
+        keywords: List[str],
+        keyword_context: str,
+    ) -> Dict[str, Any]:
+        """Analyze one page, skipping Ollama for blank and reference pages."""
+        content_type = _cheap_classify(page.raw_text)
+        if content_type is not None:
+            return {
+                "content_type": content_type,
+                "processed_text": _regex_clean(page.raw_text),
+                "structured": {},
+            }
+        return self.ai.analyze_page(
+            page.raw_text,
+            page.page_num,
+            total_pages,
+            keywords,
+            keyword_context=keyword_context,
+        )
+
     def process_with_ai(
-        self, pages: List[PageContent], metadata: DocumentMetadata
+        self,
+        pages: List[PageContent],
+        metadata: DocumentMetadata,
+        checkpoint_path: Optional[Path] = None,
     ) -> ExtractionResult:
-        """Process pages with AI enhancement."""
+        """Process pages with AI enhancement.
+
+        With ``checkpoint_path`` set, each analyzed page is appended to that
+        JSONL file and pages already in it are not analyzed again, so an
+        interrupted run resumes where it stopped.
+        """
         if not self.ai.available:
             raise RuntimeError(
                 "AI processing not available. Please install and configure Ollama."
             )
 
-        # Step 1: Extract keywords from first few pages
-        combined_text = " ".join([page.raw_text for page in pages[:3]])
-        keyword_data = self.ai.extract_keywords_and_concepts(combined_text)
-
-        # Combine all keywords
-        all_keywords = []
-        for keyword_list in keyword_data.values():
-            all_keywords.extend(keyword_list)
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            # Step 1: Extract keywords from each of the first few pages
+            keyword_pages = [page for page in pages[:3] if page.raw_text.strip()]
+            keyword_data = _merge_keyword_results(
+                executor.map(
+                    lambda page: self.ai.extract_keywords_and_concepts(page.raw_text),
+                    keyword_pages,
+                )
+            )
 
-        metadata.keywords = all_keywords[:20]  # Keep top 20 keywords
+            # Combine all keywords
+            all_keywords = []
+            for keyword_list in keyword_data.values():
+                all_keywords.extend(keyword_list)
+
+            metadata.keywords = all_keywords[:20]  # Keep top 20 keywords
+
+            # Step 2: Analyze pages concurrently; Ollama calls dominate the time
+            keyword_context = _keyword_context(all_keywords)
+            completed = self._load_checkpoint(checkpoint_path)
+            checkpoint_lock = threading.Lock()
+
+            def analyze(page: PageContent) -> Dict[str, Any]:
+                analysis = completed.get(page.page_num)
+                if analysis is None:
+                    analysis = self._analyze_page(
+                        page, len(pages), all_keywords, keyword_context
+                    )
+                    if checkpoint_path is not None:
+                        with checkpoint_lock:
+                            self._append_checkpoint(
+                                checkpoint_path, page.page_num, analysis
+                            )
+                return analysis
+
+            analyses = list(executor.map(analyze, pages))
+
+        structured_results = []
+        for page, analysis in zip(pages, analyses):
+            page.processed_text = analysis["processed_text"]
+            page.content_type = analysis["content_type"]
+            structured_results.append(analysis["structured"])
 
-        # Step 2: Process each page
         sections: Dict[str, Any] = {}
 
-        for page in pages:
-            # Fix text spacing
-            page.processed_text = self.ai.fix_text_spacing(page.raw_text)
-
-            # Classify content type
-            page.content_type = self.ai.classify_content_type(
-                page.processed_text, page.page_num, len(pages)
-            )
-
-            # Extract structured content
-            structured = self.ai.extract_structured_content(
-                page.processed_text, page.content_type, all_keywords
-            )
-
+        for page, structured in zip(pages, structured_results):
             # Store in sections
             if page.content_type not in sections:
                 sections[page.content_type] = []
@@ -467,6 +1366,108 @@ class AdvancedPDFProcessor:
 
         return result
 
+    def process_with_ai_batched(
+        self,
+        pages: List[PageContent],
+        metadata: DocumentMetadata,
+        pages_per_call: int = 4,
+    ) -> ExtractionResult:
+        """Process pages with AI, analyzing several pages per Ollama call.
+
+        Keyword extraction, classification and structured extraction are
+        combined into one prompt, so a document needs roughly
+        ``len(pages) / pages_per_call`` calls instead of several per page.
+        Text spacing is not rewritten; ``processed_text`` is the raw text.
+        """
+        if not self.ai.available:
+            raise RuntimeError(
+                "AI processing not available. Please install and configure Ollama."
+            )
+
+        # Insertion-ordered dicts deduplicate in O(1) per keyword
+        keyword_index: Dict[str, None] = {}
+        concept_index: Dict[str, None] = {}
+        sections: Dict[str, Any] = {}
+
+        for start in range(0, len(pages), max(1, pages_per_call)):
+            batch = pages[start : start + max(1, pages_per_call)]
+            analyzed = self.ai.analyze_pages(batch, len(pages))
+
+            for page in batch:
+                entry = analyzed.get(page.page_num, {})
+                keywords = [str(k) for k in entry.get("keywords", []) or []]
+                concepts = [str(c) for c in entry.get("concepts", []) or []]
+                structured = entry.get("structured")
+                if not isinstance(structured, dict):
+                    structured = {"extraction_error": "Page missing from response"}
+
+                page.processed_text = page.raw_text
+                page.content_type = _content_type(entry.get("content_type"))
+                page.keywords = keywords
+
+                keyword_index.update(dict.fromkeys(keywords))
+                concept_index.update(dict.fromkeys(concepts))
+
+                if page.content_type not in sections:
+                    sections[page.content_type] = []
+                sections[page.content_type].append(
+                    {
+                        "page": page.page_num,
+                        "content": page.processed_text,
+                        "structured": structured,
+                    }
+                )
+
+        all_keywords = list(keyword_index)
+        metadata.keywords = all_keywords[:20]  # Keep top 20 keywords
+
+        return ExtractionResult(
+            metadata=metadata,
+            pages=pages,
+            sections=sections,
+            all_keywords=all_keywords,
+            key_concepts=list(concept_index),
+        )
+
+    def _start_warm_up(self) -> None:
+        """Load the Ollama model in the background."""
+        if self.ai.available:
+            threading.Thread(target=self.ai.warm_up, daemon=True).start()
+
+    def process_pdf_batched(
+        self,
+        pdf_path: Path,
+        bib_file: Optional[Path] = None,
+        pages_per_call: int = 4,
+    ) -> ExtractionResult:
+        """Processing function using batched multi-page Ollama calls."""
+        start_time = time.time()
+
+        if bib_file and not self.bib_data:
+            self.bib_data = self._load_bibliography(bib_file)
+
+        metadata = self._get_metadata_from_bib(pdf_path.stem)
+
+        cache_path = self._result_cache_path(
+            pdf_path, metadata, f"batched:{pages_per_call}"
+        )
+        cached = self._load_cached_result(cache_path)
+        if cached is not None:
+            return cached
+
+        self._start_warm_up()
+        pages = self.extract_pdf_content(pdf_path)
+        metadata.page_count = len(pages)
+
+        result = self.process_with_ai_batched(pages, metadata, pages_per_call)
+
+        result.metadata.processing_time = time.time() - start_time
+
+        if cache_path is not None:
+            write_json(cache_path, result.to_dict())
+
+        return result
+
     def process_pdf(
         self, pdf_path: Path, bib_file: Optional[Path] = None
     ) -> ExtractionResult:
@@ -483,15 +1484,30 @@ class AdvancedPDFProcessor:
         # Get metadata from bibliography
         metadata = self._get_metadata_from_bib(cite_key)
 
+        # Reuse a previous result for an unchanged PDF
+        cache_path = self._result_cache_path(pdf_path, metadata, "pages")
+        cached = self._load_cached_result(cache_path)
+        if cached is not None:
+            return cached
+
+        # Load the model while the PDF text is extracted
+        self._start_warm_up()
+
         # Extract PDF content
         pages = self.extract_pdf_content(pdf_path)
         metadata.page_count = len(pages)
 
-        # Process with AI
-        result = self.process_with_ai(pages, metadata)
+        # Process with AI, checkpointing pages so a crash can resume
+        checkpoint_path = self._checkpoint_path(cache_path)
+        result = self.process_with_ai(pages, metadata, checkpoint_path)
 
         # Calculate processing time
         processing_time = time.time() - start_time
         result.metadata.processing_time = processing_time
 
+        if cache_path is not None:
+            write_json(cache_path, result.to_dict())
+        if checkpoint_path is not None:
+            checkpoint_path.unlink(missing_ok=True)
+
         return result
@@ -4,12 +4,18 @@ Knowledge tracking and indexing system for PDF extractions.
 
 import argparse
 import json
+import os
 import re
 import sqlite3
-from collections import Counter
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# Below this many documents, worker processes cost more than they save
+PARALLEL_PREPARE_MIN_DOCUMENTS = 8
 
 
 class KnowledgeTracker:
@@ -17,199 +23,355 @@ class KnowledgeTracker:
 
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or Path("knowledge_index.db")
+        # One persistent connection per thread, opened on first use
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # Full-text keyword search; falls back to LIKE without FTS5
+        self.has_fts = False
         self.init_database()
 
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening and tuning it if needed."""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can run from any thread;
+            # each connection is still used by the thread that opened it.
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Yield the thread's connection, committing unless inside batch().
+
+        Inside batch() the block runs in a savepoint instead, so a write
+        that fails halfway is undone without discarding the whole batch.
+        """
+        conn = self._get_conn()
+        if getattr(self._local, "batching", False):
+            conn.execute("SAVEPOINT write")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK TO write")
+                raise
+            finally:
+                conn.execute("RELEASE write")
+            return
+
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    @contextmanager
+    def batch(self) -> Iterator["KnowledgeTracker"]:
+        """Group all writes made inside the block into a single transaction.
+
+        Example::
+
+            with tracker.batch():
+                for result in results:
+                    tracker.add_extraction_result(result.to_dict(), path)
+        """
+        if getattr(self._local, "batching", False):
+            yield self  # Already batching; the outer block commits
+            return
+
+        conn = self._get_conn()
+        conn.execute("BEGIN")
+        self._local.batching = True
+        try:
+            yield self
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.batching = False
+
+    def close(self) -> None:
+        """Close every connection opened by this tracker."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def __enter__(self) -> "KnowledgeTracker":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def init_database(self) -> None:
         """Initialize SQLite database for knowledge tracking."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        # Documents table
-        cursor.execute(
+            # Documents table
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS documents (
+                    cite_key TEXT PRIMARY KEY,
+                    title TEXT,
+                    authors TEXT,  -- JSON array
+                    year TEXT,
+                    keywords TEXT,  -- JSON array
+                    key_concepts TEXT,  -- JSON array
+                    page_count INTEGER,
+                    extraction_date TEXT,
+                    file_path TEXT,
+                    processing_time REAL
+                )
             """
-            CREATE TABLE IF NOT EXISTS documents (
-                cite_key TEXT PRIMARY KEY,
-                title TEXT,
-                authors TEXT,  -- JSON array
-                year TEXT,
-                keywords TEXT,  -- JSON array
-                key_concepts TEXT,  -- JSON array
-                page_count INTEGER,
-                extraction_date TEXT,
-                file_path TEXT,
-                processing_time REAL
             )
-        """
-        )
 
-        # Pages table
-        cursor.execute(
+            # Pages table
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cite_key TEXT,
+                    page_num INTEGER,
+                    content_type TEXT,
+                    keywords TEXT,  -- JSON array
+                    word_count INTEGER,
+                    has_figures BOOLEAN,
+                    has_tables BOOLEAN,
+                    has_equations BOOLEAN,
+                    FOREIGN KEY (cite_key) REFERENCES documents (cite_key)
+                )
             """
-            CREATE TABLE IF NOT EXISTS pages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                cite_key TEXT,
-                page_num INTEGER,
-                content_type TEXT,
-                keywords TEXT,  -- JSON array
-                word_count INTEGER,
-                has_figures BOOLEAN,
-                has_tables BOOLEAN,
-                has_equations BOOLEAN,
-                FOREIGN KEY (cite_key) REFERENCES documents (cite_key)
             )
-        """
-        )
 
-        # Keywords table for fast searching
-        cursor.execute(
+            # Keywords table for fast searching
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS keywords (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    keyword TEXT,
+                    cite_key TEXT,
+                    page_num INTEGER,
+                    frequency INTEGER,
+                    context TEXT,
+                    FOREIGN KEY (cite_key) REFERENCES documents (cite_key)
+                )
             """
-            CREATE TABLE IF NOT EXISTS keywords (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                keyword TEXT,
-                cite_key TEXT,
-                page_num INTEGER,
-                frequency INTEGER,
-                context TEXT,
-                FOREIGN KEY (cite_key) REFERENCES documents (cite_key)
             )
-        """
-        )
 
-        # Concepts network table
-        cursor.execute(
+            # Concepts network table
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS concept_network (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    concept TEXT,
+                    related_concept TEXT,
+                    cite_key TEXT,
+                    co_occurrence_count INTEGER,
+                    FOREIGN KEY (cite_key) REFERENCES documents (cite_key)
+                )
             """
-            CREATE TABLE IF NOT EXISTS concept_network (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                concept TEXT,
-                related_concept TEXT,
-                cite_key TEXT,
-                co_occurrence_count INTEGER,
-                FOREIGN KEY (cite_key) REFERENCES documents (cite_key)
             )
-        """
-        )
 
-        # Create indexes for fast searching
+            # Create indexes for fast searching
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_keywords_keyword ON keywords(keyword)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_keywords_cite_key ON keywords(cite_key)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_keywords_cite_page "
+                "ON keywords(cite_key, page_num)"
+            )
+            # Covers prefix searches so they never touch the table rows
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_keywords_search "
+                "ON keywords(keyword, frequency DESC, cite_key, page_num)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_concepts_concept "
+                "ON concept_network(concept)"
+            )
+            # Re-ingesting a document deletes its rows by cite_key
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_pages_cite_key ON pages(cite_key)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_concepts_cite_key "
+                "ON concept_network(cite_key)"
+            )
+
+            self.has_fts = self._init_fts(cursor)
+
+    @staticmethod
+    def _init_fts(cursor: sqlite3.Cursor) -> bool:
+        """Create the FTS5 index over keywords, kept in sync by triggers.
+
+        Returns False if this SQLite build has no FTS5 support.
+        """
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_keywords_keyword ON keywords(keyword)"
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='keywords_fts'"
         )
+        existed = cursor.fetchone() is not None
+
+        try:
+            cursor.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS keywords_fts USING fts5(
+                    keyword, context,
+                    content='keywords', content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            """
+            )
+        except sqlite3.OperationalError:
+            return False
+
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_keywords_cite_key ON keywords(cite_key)"
+            """
+            CREATE TRIGGER IF NOT EXISTS keywords_fts_insert
+            AFTER INSERT ON keywords BEGIN
+                INSERT INTO keywords_fts (rowid, keyword, context)
+                VALUES (new.id, new.keyword, new.context);
+            END
+        """
         )
         cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_concepts_concept "
-            "ON concept_network(concept)"
+            """
+            CREATE TRIGGER IF NOT EXISTS keywords_fts_delete
+            AFTER DELETE ON keywords BEGIN
+                INSERT INTO keywords_fts (keywords_fts, rowid, keyword, context)
+                VALUES ('delete', old.id, old.keyword, old.context);
+            END
+        """
         )
 
-        conn.commit()
-        conn.close()
+        # Index keywords stored before the FTS table existed
+        if not existed:
+            cursor.execute("INSERT INTO keywords_fts (keywords_fts) VALUES ('rebuild')")
+        return True
 
     def add_extraction_result(
         self, result_data: Dict[str, Any], file_path: str
     ) -> None:
         """Add extraction result to knowledge database."""
-        metadata = result_data.get("metadata", {})
-        pages = result_data.get("pages", [])
-
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self._write_rows(*_prepare_rows(result_data, file_path))
 
-        # Insert/update document
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO documents
-            (cite_key, title, authors, year, keywords, key_concepts, page_count,
-             extraction_date, file_path, processing_time)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                metadata.get("cite_key", ""),
-                metadata.get("title", ""),
-                json.dumps(metadata.get("authors", [])),
-                metadata.get("year", ""),
-                json.dumps(metadata.get("keywords", [])),
-                json.dumps(result_data.get("key_concepts", [])),
-                metadata.get("page_count", 0),
-                metadata.get("extraction_date", ""),
-                file_path,
-                metadata.get("processing_time", 0.0),
-            ),
-        )
+    def add_extraction_results(
+        self,
+        results: Iterable[Tuple[Dict[str, Any], str]],
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """Add many ``(result_data, file_path)`` pairs in one transaction.
 
-        cite_key = metadata.get("cite_key", "")
+        For larger batches the rows are prepared in worker processes while
+        this thread does all the writing.
+        """
+        results = list(results)
+        with self.batch():
+            if (
+                len(results) < PARALLEL_PREPARE_MIN_DOCUMENTS
+                or (os.cpu_count() or 1) < 2
+            ):
+                for result_data, file_path in results:
+                    self.add_extraction_result(result_data, file_path)
+                return
+
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for rows in executor.map(_prepare_rows, *zip(*results)):
+                    self._write_rows(*rows)
+
+    def _write_rows(
+        self,
+        document_row: Tuple[Any, ...],
+        page_rows: List[Tuple[Any, ...]],
+        keyword_rows: List[Tuple[Any, ...]],
+    ) -> None:
+        """Replace one document's rows with rows from _prepare_rows()."""
+        cite_key = document_row[0]
 
-        # Clear existing pages and keywords for this document
-        cursor.execute("DELETE FROM pages WHERE cite_key = ?", (cite_key,))
-        cursor.execute("DELETE FROM keywords WHERE cite_key = ?", (cite_key,))
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        # Insert pages
-        for page_data in pages:
+            # Insert/update document
             cursor.execute(
+                """
+                INSERT OR REPLACE INTO documents
+                (cite_key, title, authors, year, keywords, key_concepts, page_count,
+                 extraction_date, file_path, processing_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                document_row,
+            )
+
+            # Clear existing pages and keywords for this document
+            cursor.execute("DELETE FROM pages WHERE cite_key = ?", (cite_key,))
+            cursor.execute("DELETE FROM keywords WHERE cite_key = ?", (cite_key,))
+
+            # Insert pages and their keywords in two batched statements
+            cursor.executemany(
                 """
                 INSERT INTO pages
                 (cite_key, page_num, content_type, keywords, word_count,
                  has_figures, has_tables, has_equations)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
-                (
-                    cite_key,
-                    page_data.get("page_num", 0),
-                    page_data.get("content_type", "main"),
-                    json.dumps(page_data.get("keywords", [])),
-                    len(page_data.get("processed_text", "").split()),
-                    len(page_data.get("figures", [])) > 0,
-                    len(page_data.get("tables", [])) > 0,
-                    len(page_data.get("equations", [])) > 0,
-                ),
+                page_rows,
+            )
+            cursor.executemany(
+                """
+                INSERT INTO keywords
+                (keyword, cite_key, page_num, frequency, context)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                keyword_rows,
             )
 
-            # Insert keywords for this page
-            page_keywords = page_data.get("keywords", [])
-            page_text = page_data.get("processed_text", "")
-
-            for keyword in page_keywords:
-                # Count frequency of keyword in page
-                frequency = len(
-                    re.findall(re.escape(keyword.lower()), page_text.lower())
-                )
-
-                # Extract context (sentence containing keyword)
-                context = self._extract_keyword_context(keyword, page_text)
-
-                cursor.execute(
-                    """
-                    INSERT INTO keywords
-                    (keyword, cite_key, page_num, frequency, context)
-                    VALUES (?, ?, ?, ?, ?)
-                """,
-                    (
-                        keyword.lower(),
-                        cite_key,
-                        page_data.get("page_num", 0),
-                        frequency,
-                        context,
-                    ),
-                )
-
-        conn.commit()
-        conn.close()
-
-        # Build concept network for this document
-        self._build_concept_network_for_document(cite_key)
+            # Build concept network for this document in the same transaction
+            self._build_concept_network(cursor, cite_key)
 
+    @staticmethod
     def _extract_keyword_context(
-        self, keyword: str, text: str, context_length: int = 200
+        keyword: str,
+        text: str,
+        context_length: int = 200,
+        text_lower: Optional[str] = None,
     ) -> str:
-        """Extract context around a keyword."""
-        text_lower = text.lower()
+        """Extract context around a keyword.
+
+        Pass ``text_lower`` when the lowercased text is already at hand, to
+        avoid lowercasing the whole page again for every keyword.
+        """
+        if text_lower is None:
+            text_lower = text.lower()
         keyword_lower = keyword.lower()
 
         pos = text_lower.find(keyword_lower)
         if pos == -1:
             return ""
 
-        start = max(0, pos - context_length // 2)
-        end = min(len(text), pos + len(keyword) + context_length // 2)
+        return KnowledgeTracker._context_at(
+            text, pos, pos + len(keyword), context_length
+        )
+
+    @staticmethod
+    def _context_at(text: str, start: int, end: int, context_length: int = 200) -> str:
+        """Slice the text around a known match at ``text[start:end]``."""
+        start = max(0, start - context_length // 2)
+        end = min(len(text), end + context_length // 2)
 
         context = text[start:end].strip()
 
@@ -221,135 +383,148 @@ class KnowledgeTracker:
 
         return context
 
-    def _build_concept_network_for_document(self, cite_key: str) -> None:
-        """Build concept co-occurrence network for a specific document."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
+    @staticmethod
+    def _build_concept_network(cursor: sqlite3.Cursor, cite_key: str) -> None:
+        """Rebuild a document's co-occurrence rows using an open cursor."""
         # Clear existing network for this document
         cursor.execute("DELETE FROM concept_network WHERE cite_key = ?", (cite_key,))
 
-        # Get all keywords for this document
+        # Pair up keywords that share a page, counting the pages they share
         cursor.execute(
             """
-            SELECT keyword, COUNT(*) as frequency
-            FROM keywords
-            WHERE cite_key = ?
-            GROUP BY keyword
-            ORDER BY frequency DESC
-            LIMIT 20
+            INSERT INTO concept_network
+            (concept, related_concept, cite_key, co_occurrence_count)
+            SELECT a.keyword, b.keyword, a.cite_key, COUNT(*)
+            FROM keywords a
+            JOIN keywords b
+              ON a.cite_key = b.cite_key
+             AND a.page_num = b.page_num
+             AND a.keyword < b.keyword
+            WHERE a.cite_key = ?
+            GROUP BY a.keyword, b.keyword
         """,
             (cite_key,),
         )
 
-        keywords = [row[0] for row in cursor.fetchall()]
+    def search_keywords(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Search for keywords and return matching documents.
+
+        With FTS5, each word of the query is matched as a prefix against
+        keywords and their context, ranking keyword hits first. Otherwise
+        keywords starting with the query are returned, most frequent first.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        # Build co-occurrence matrix
-        for i, kw1 in enumerate(keywords):
-            for kw2 in keywords[i + 1 :]:
+            terms = re.findall(r"\w+", query.lower())
+            if self.has_fts and terms:
+                match = " ".join(f'"{term}"*' for term in terms)
                 cursor.execute(
                     """
-                    INSERT INTO concept_network
-                    (concept, related_concept, cite_key, co_occurrence_count)
-                    VALUES (?, ?, ?, ?)
+                    SELECT k.cite_key, d.title, d.authors, k.keyword,
+                           k.context, k.page_num
+                    FROM keywords_fts f
+                    JOIN keywords k ON k.id = f.rowid
+                    JOIN documents d ON k.cite_key = d.cite_key
+                    WHERE keywords_fts MATCH ?
+                    ORDER BY bm25(keywords_fts, 10.0, 1.0), k.frequency DESC
+                    LIMIT ?
                 """,
-                    (kw1, kw2, cite_key, 1),
+                    (match, limit),
+                )
+            else:
+                # A bounded range walks idx_keywords_search, unlike LIKE '%q%'
+                prefix = query.lower()
+                cursor.execute(
+                    """
+                    SELECT DISTINCT k.cite_key, d.title, d.authors, k.keyword,
+                           k.context, k.page_num
+                    FROM keywords k
+                    JOIN documents d ON k.cite_key = d.cite_key
+                    WHERE k.keyword >= ? AND k.keyword < ?
+                    ORDER BY k.frequency DESC
+                    LIMIT ?
+                """,
+                    (prefix, prefix + "\U0010ffff", limit),
                 )
 
-        conn.commit()
-        conn.close()
-
-    def search_keywords(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
-        """Search for keywords and return matching documents."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Search keywords
-        cursor.execute(
-            """
-            SELECT DISTINCT k.cite_key, d.title, d.authors, k.keyword,
-                   k.context, k.page_num
-            FROM keywords k
-            JOIN documents d ON k.cite_key = d.cite_key
-            WHERE k.keyword LIKE ?
-            ORDER BY k.frequency DESC
-            LIMIT ?
-        """,
-            (f"%{query.lower()}%", limit),
-        )
-
-        results = []
-        for row in cursor.fetchall():
-            cite_key, title, authors_json, keyword, context, page_num = row
-            authors = json.loads(authors_json) if authors_json else []
-
-            results.append(
-                {
-                    "cite_key": cite_key,
-                    "title": title,
-                    "authors": authors,
-                    "keyword": keyword,
-                    "context": context,
-                    "page_num": page_num,
-                }
-            )
-
-        conn.close()
+            results = []
+            for row in cursor:
+                authors_json = row["authors"]
+                results.append(
+                    {
+                        "cite_key": row["cite_key"],
+                        "title": row["title"],
+                        "authors": (
+                            json.loads(authors_json)
+                            if authors_json not in (None, "", "[]")
+                            else []
+                        ),
+                        "keyword": row["keyword"],
+                        "context": row["context"],
+                        "page_num": row["page_num"],
+                    }
+                )
         return results
 
     def get_document_stats(self) -> Dict[str, Any]:
         """Get comprehensive statistics about the knowledge base."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Basic counts
-        cursor.execute("SELECT COUNT(*) FROM documents")
-        doc_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM pages")
-        page_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(DISTINCT keyword) FROM keywords")
-        unique_keywords = cursor.fetchone()[0]
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) FROM keywords")
-        total_keyword_instances = cursor.fetchone()[0]
-
-        # Top keywords
-        cursor.execute(
+            # Basic counts, gathered in a single pass through SQLite
+            cursor.execute(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM documents),
+                    (SELECT COUNT(*) FROM pages),
+                    (SELECT COUNT(DISTINCT keyword) FROM keywords),
+                    (SELECT COUNT(*) FROM keywords)
             """
-            SELECT keyword, COUNT(*) as frequency
-            FROM keywords
-            GROUP BY keyword
-            ORDER BY frequency DESC
-            LIMIT 10
-        """
-        )
-        top_keywords = cursor.fetchall()
-
-        # Top authors
-        cursor.execute("SELECT authors FROM documents WHERE authors != '[]'")
-        all_authors = []
-        for (authors_json,) in cursor.fetchall():
-            authors = json.loads(authors_json)
-            all_authors.extend(authors)
+            )
+            (
+                doc_count,
+                page_count,
+                unique_keywords,
+                total_keyword_instances,
+            ) = cursor.fetchone()
 
-        author_counts = Counter(all_authors)
-        top_authors = author_counts.most_common(10)
+            # Top keywords
+            cursor.execute(
+                """
+                SELECT keyword, COUNT(*) as frequency
+                FROM keywords
+                GROUP BY keyword
+                ORDER BY frequency DESC
+                LIMIT 10
+            """
+            )
+            top_keywords = [tuple(row) for row in cursor]
 
-        # Year distribution
-        cursor.execute(
+            # Top authors, unpacked from the JSON arrays inside SQLite
+            cursor.execute(
+                """
+                SELECT j.value AS author, COUNT(*) AS count
+                FROM documents d, json_each(d.authors) j
+                WHERE json_valid(d.authors)
+                GROUP BY j.value
+                ORDER BY count DESC, author
+                LIMIT 10
             """
-            SELECT year, COUNT(*) as count
-            FROM documents
-            WHERE year != ''
-            GROUP BY year
-            ORDER BY year DESC
-        """
-        )
-        year_distribution = cursor.fetchall()
+            )
+            top_authors = [tuple(row) for row in cursor]
 
-        conn.close()
+            # Year distribution
+            cursor.execute(
+                """
+                SELECT year, COUNT(*) as count
+                FROM documents
+                WHERE year != ''
+                GROUP BY year
+                ORDER BY year DESC
+            """
+            )
+            year_distribution = [tuple(row) for row in cursor]
 
         return {
             "document_count": doc_count,
@@ -365,77 +540,151 @@ class KnowledgeTracker:
         self, concept: str, limit: int = 10
     ) -> List[Tuple[str, int]]:
         """Get concepts related to the given concept."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        pattern = f"%{concept.lower()}%"
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            """
-            SELECT related_concept, SUM(co_occurrence_count) as total_count
-            FROM concept_network
-            WHERE concept LIKE ?
-            GROUP BY related_concept
-            ORDER BY total_count DESC
-            LIMIT ?
-        """,
-            (f"%{concept.lower()}%", limit),
-        )
+            # Each pair is stored once, so match the concept on either side
+            cursor.execute(
+                """
+                SELECT related_concept, SUM(co_occurrence_count) as total_count
+                FROM (
+                    SELECT related_concept, co_occurrence_count
+                    FROM concept_network
+                    WHERE concept LIKE ?
+                    UNION ALL
+                    SELECT concept, co_occurrence_count
+                    FROM concept_network
+                    WHERE related_concept LIKE ?
+                )
+                GROUP BY related_concept
+                ORDER BY total_count DESC, related_concept
+                LIMIT ?
+            """,
+                (pattern, pattern, limit),
+            )
 
-        results = cursor.fetchall()
-        conn.close()
+            results = [(row["related_concept"], row["total_count"]) for row in cursor]
 
         return results
 
     def export_knowledge_graph(self, output_file: Path) -> None:
-        """Export knowledge graph for visualization."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Export knowledge graph for visualization.
 
-        # Get nodes (concepts)
-        cursor.execute(
-            """
-            SELECT keyword, COUNT(*) as frequency
-            FROM keywords
-            GROUP BY keyword
-            HAVING frequency > 2
-            ORDER BY frequency DESC
-            LIMIT 100
+        Nodes and edges are streamed from the cursor into the file one JSON
+        object per line, so the graph is never held in memory.
         """
-        )
-        nodes = [
-            {"id": keyword, "frequency": freq} for keyword, freq in cursor.fetchall()
-        ]
+        with self._connect() as conn, output_file.open("w", encoding="utf-8") as out:
+            # Nodes (concepts)
+            out.write('{"nodes": [')
+            node_count = self._write_json_rows(
+                out,
+                conn.execute(
+                    """
+                    SELECT keyword, COUNT(*) as frequency
+                    FROM keywords
+                    GROUP BY keyword
+                    HAVING frequency > 2
+                    ORDER BY frequency DESC
+                    LIMIT 100
+                """
+                ),
+                ("id", "frequency"),
+            )
 
-        # Get edges (co-occurrences)
-        cursor.execute(
-            """
-            SELECT concept, related_concept, SUM(co_occurrence_count) as weight
-            FROM concept_network
-            GROUP BY concept, related_concept
-            HAVING weight > 1
-            ORDER BY weight DESC
-            LIMIT 200
-        """
-        )
-        edges = [
-            {"source": c1, "target": c2, "weight": weight}
-            for c1, c2, weight in cursor.fetchall()
-        ]
-
-        # Export as JSON
-        graph_data = {
-            "nodes": nodes,
-            "edges": edges,
-            "metadata": {
+            # Edges (co-occurrences)
+            out.write('],\n"edges": [')
+            edge_count = self._write_json_rows(
+                out,
+                conn.execute(
+                    """
+                    SELECT concept, related_concept,
+                           SUM(co_occurrence_count) as weight
+                    FROM concept_network
+                    GROUP BY concept, related_concept
+                    HAVING weight > 1
+                    ORDER BY weight DESC
+                    LIMIT 200
+                """
+                ),
+                ("source", "target", "weight"),
+            )
+
+            metadata = {
                 "generated": datetime.now().isoformat(),
-                "node_count": len(nodes),
-                "edge_count": len(edges),
-            },
-        }
+                "node_count": node_count,
+                "edge_count": edge_count,
+            }
+            out.write('],\n"metadata": ' + json.dumps(metadata) + "}\n")
+
+    @staticmethod
+    def _write_json_rows(
+        out: TextIO, rows: Iterable[Tuple[Any, ...]], keys: Tuple[str, ...]
+    ) -> int:
+        """Write rows as comma-separated JSON objects and return how many."""
+        count = 0
+        for row in rows:
+            out.write(",\n" if count else "\n")
+            out.write(json.dumps(dict(zip(keys, row)), ensure_ascii=False))
+            count += 1
+        return count
+
+
+def _prepare_rows(
+    result_data: Dict[str, Any], file_path: str
+) -> Tuple[Tuple[Any, ...], List[Tuple[Any, ...]], List[Tuple[Any, ...]]]:
+    """Turn an extraction result into document, page and keyword rows.
+
+    Pure Python with no database access, so it can run in a worker process.
+    """
+    metadata = result_data.get("metadata", {})
+    pages = result_data.get("pages", [])
+    cite_key = metadata.get("cite_key", "")
+
+    document_row = (
+        cite_key,
+        metadata.get("title", ""),
+        json.dumps(metadata.get("authors", [])),
+        metadata.get("year", ""),
+        json.dumps(metadata.get("keywords", [])),
+        json.dumps(result_data.get("key_concepts", [])),
+        metadata.get("page_count", 0),
+        metadata.get("extraction_date", ""),
+        file_path,
+        metadata.get("processing_time", 0.0),
+    )
+
+    page_rows = []
+    keyword_rows = []
+    for page_data in pages:
+        page_num = page_data.get("page_num", 0)
+        page_keywords = page_data.get("keywords", [])
+        page_text = page_data.get("processed_text", "")
+        page_lower = page_text.lower()
+
+        page_rows.append(
+            (
+                cite_key,
+                page_num,
+                page_data.get("content_type", "main"),
+                json.dumps(page_keywords),
+                len(page_text.split()),
+                len(page_data.get("figures", [])) > 0,
+                len(page_data.get("tables", [])) > 0,
+                len(page_data.get("equations", [])) > 0,
+            )
+        )
+
+        for keyword in page_keywords:
+            keyword_lower = keyword.lower()
+            frequency = page_lower.count(keyword_lower)
+            context = KnowledgeTracker._extract_keyword_context(
+                keyword, page_text, text_lower=page_lower
+            )
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(graph_data, f, indent=2, ensure_ascii=False)
+            keyword_rows.append((keyword_lower, cite_key, page_num, frequency, context))
 
-        conn.close()
+    return document_row, page_rows, keyword_rows
 
 
 def main() -> None:
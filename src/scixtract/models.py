@@ -2,12 +2,12 @@
 Data models for AI PDF extraction and knowledge tracking.
 """
 
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from typing import Any, Dict, List
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentMetadata:
     """Comprehensive document metadata structure."""
 
@@ -30,10 +30,30 @@ class DocumentMetadata:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        # Built by hand: asdict() deep-copies every field recursively
+        return {
+            "cite_key": self.cite_key,
+            "title": self.title,
+            "authors": list(self.authors),
+            "year": self.year,
+            "journal": self.journal,
+            "doi": self.doi,
+            "url": self.url,
+            "keywords": list(self.keywords),
+            "abstract": self.abstract,
+            "page_count": self.page_count,
+            "extraction_date": self.extraction_date,
+            "processing_time": self.processing_time,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DocumentMetadata":
+        """Create from a dictionary produced by to_dict()."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
 
 
-@dataclass
+@dataclass(slots=True)
 class PageContent:
     """Structure for individual page content."""
 
@@ -46,15 +66,27 @@ class PageContent:
     tables: List[str] = field(default_factory=list)
     equations: List[str] = field(default_factory=list)
 
-    def __post_init__(self) -> None:
-        pass  # All defaults are now handled by field(default_factory=list)
-
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        return {
+            "page_num": self.page_num,
+            "raw_text": self.raw_text,
+            "processed_text": self.processed_text,
+            "content_type": self.content_type,
+            "keywords": list(self.keywords),
+            "figures": list(self.figures),
+            "tables": list(self.tables),
+            "equations": list(self.equations),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PageContent":
+        """Create from a dictionary produced by to_dict()."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionResult:
     """Complete extraction result structure."""
 
@@ -82,8 +114,23 @@ class ExtractionResult:
             "future_work": self.future_work,
         }
 
-
-@dataclass
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExtractionResult":
+        """Create from a dictionary produced by to_dict()."""
+        return cls(
+            metadata=DocumentMetadata.from_dict(data["metadata"]),
+            pages=[PageContent.from_dict(page) for page in data["pages"]],
+            sections=data["sections"],
+            all_keywords=data["all_keywords"],
+            key_concepts=data["key_concepts"],
+            methodology=data.get("methodology", ""),
+            main_findings=data.get("main_findings", ""),
+            conclusions=data.get("conclusions", ""),
+            future_work=data.get("future_work", ""),
+        )
+
+
+@dataclass(slots=True)
 class DocumentIndex:
     """Index entry for a processed document."""
 
@@ -98,10 +145,20 @@ class DocumentIndex:
     file_path: str
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "cite_key": self.cite_key,
+            "title": self.title,
+            "authors": list(self.authors),
+            "year": self.year,
+            "keywords": list(self.keywords),
+            "key_concepts": list(self.key_concepts),
+            "page_count": self.page_count,
+            "extraction_date": self.extraction_date,
+            "file_path": self.file_path,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class PageIndex:
     """Index entry for a page within a document."""
 
@@ -115,7 +172,7 @@ class PageIndex:
     has_equations: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class ConceptNetwork:
     """Network of related concepts across documents."""
 
@@ -3,151 +3,300 @@ Ollama setup and configuration utilities.
 """
 
 import argparse
+import functools
 import json
+import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
 
-import requests
+if TYPE_CHECKING:
+    import requests
 
+try:
+    import orjson
 
-class OllamaSetup:
-    """Setup and configuration for Ollama."""
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-    def __init__(self) -> None:
-        self.base_url = "http://localhost:11434"
-        self.recommended_models = {
-            "qwen2.5:7b": {
+from .cache import cache_dir, read_json, write_json
+
+# How long a /api/tags listing is reused before asking the server again
+TAGS_CACHE_TTL = 5.0
+# How long to wait for a freshly started ``ollama serve`` to answer
+SERVE_START_TIMEOUT = 5.0
+# How long a passed model test is trusted for an unchanged model
+MODEL_TEST_CACHE_TTL = 24 * 3600
+
+# Models offered by setup; shared read-only by every OllamaSetup instance
+RECOMMENDED_MODELS: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+    {
+        "qwen2.5:7b": MappingProxyType(
+            {
                 "size": "2.0GB",
                 "description": "Latest Llama model, excellent for text processing",
-                "strengths": ["Text analysis", "JSON output", "Academic content"],
+                "strengths": ("Text analysis", "JSON output", "Academic content"),
                 "recommended": True,
-            },
-            "qwen2.5:32b-instruct-q4_K_M": {
+            }
+        ),
+        "qwen2.5:32b-instruct-q4_K_M": MappingProxyType(
+            {
                 "size": "19GB",
                 "description": "High-quality model with excellent JSON output",
-                "strengths": [
+                "strengths": (
                     "Perfect JSON",
                     "Academic analysis",
                     "Keyword extraction",
-                ],
+                ),
                 "recommended": True,
-            },
-            "qwen2:72b": {
+            }
+        ),
+        "qwen2:72b": MappingProxyType(
+            {
                 "size": "40GB",
                 "description": "Large model with superior reasoning",
-                "strengths": [
+                "strengths": (
                     "Complex reasoning",
                     "High accuracy",
                     "Detailed analysis",
-                ],
+                ),
                 "recommended": False,
-            },
-            "mistral": {
+            }
+        ),
+        "mistral": MappingProxyType(
+            {
                 "size": "4.1GB",
                 "description": "Fast and efficient model for text processing",
-                "strengths": ["Speed", "Efficiency", "Good JSON output"],
+                "strengths": ("Speed", "Efficiency", "Good JSON output"),
                 "recommended": False,
-            },
+            }
+        ),
+    }
+)
+
+
+def _model_tests_path() -> Path:
+    """Where passed model tests are remembered between runs."""
+    return cache_dir() / "model_tests.json"
+
+
+@functools.lru_cache(maxsize=1)
+def _home_free_gb() -> float:
+    """Free space on the home filesystem in GB, measured once per process."""
+    return shutil.disk_usage(Path.home()).free / (1024**3)
+
+
+class OllamaSetup:
+    """Setup and configuration for Ollama."""
+
+    def __init__(self) -> None:
+        self.base_url = "http://localhost:11434"
+        self._http: Optional["requests.Session"] = None
+        # Installed model names mapped to their digests
+        self._tags_cache: Optional[Tuple[float, Dict[str, str]]] = None
+        self._model_tests_lock = threading.Lock()
+        self._print_lock = threading.Lock()
+        self.recommended_models = RECOMMENDED_MODELS
+
+    @property
+    def _session(self) -> "requests.Session":
+        """Keep-alive session so status checks and model tests share a socket.
+
+        Created on first use: ``--list-models`` never imports requests.
+        """
+        if self._http is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            self._http = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            self._http.mount("http://", adapter)
+            self._http.mount("https://", adapter)
+        return self._http
+
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def __enter__(self) -> "OllamaSetup":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _fetch_tags(self, timeout: float = 10) -> List[str]:
+        """Return installed model names from /api/tags.
+
+        A successful listing is reused for TAGS_CACHE_TTL seconds, so the
+        service check and the model listing cost one round-trip. Raises
+        requests exceptions on failure, including HTTPError for bad status.
+        """
+        return list(self._fetch_digests(timeout))
+
+    def _fetch_digests(self, timeout: float = 10) -> Dict[str, str]:
+        """Return installed model names mapped to digests; see _fetch_tags()."""
+        now = time.monotonic()
+        if self._tags_cache is not None and now - self._tags_cache[0] < TAGS_CACHE_TTL:
+            return self._tags_cache[1]
+
+        response = self._session.get(f"{self.base_url}/api/tags", timeout=timeout)
+        response.raise_for_status()
+        data = orjson.loads(response.content) if HAS_ORJSON else response.json()
+        digests = {
+            model["name"]: model.get("digest", "") for model in data.get("models", ())
         }
+        self._tags_cache = (now, digests)
+        return digests
+
+    def _report(self, message: str) -> None:
+        """Print a status line; the probes may run on separate threads."""
+        with self._print_lock:
+            print(message)
+
+    def check_ollama_installed(self, show_version: bool = False) -> bool:
+        """Check if Ollama is installed.
+
+        Looks the binary up on PATH; only runs ``ollama --version`` when
+        ``show_version`` asks for the version string.
+        """
+        path = shutil.which("ollama")
+        if path is None:
+            self._report("❌ Ollama not found in PATH")
+            return False
+        if not show_version:
+            self._report(f"✅ Ollama is installed: {path}")
+            return True
 
-    def check_ollama_installed(self) -> bool:
-        """Check if Ollama is installed."""
         try:
             result = subprocess.run(
                 ["ollama", "--version"], capture_output=True, text=True, timeout=10
             )
             if result.returncode == 0:
-                print(f"✅ Ollama is installed: {result.stdout.strip()}")
+                self._report(f"✅ Ollama is installed: {result.stdout.strip()}")
                 return True
             else:
-                print("❌ Ollama command failed")
+                self._report("❌ Ollama command failed")
                 return False
         except FileNotFoundError:
-            print("❌ Ollama not found in PATH")
+            self._report("❌ Ollama not found in PATH")
             return False
         except subprocess.TimeoutExpired:
-            print("❌ Ollama command timed out")
+            self._report("❌ Ollama command timed out")
             return False
         except Exception as e:
-            print(f"❌ Error checking Ollama: {e}")
+            self._report(f"❌ Error checking Ollama: {e}")
             return False
 
     def check_ollama_running(self) -> bool:
         """Check if Ollama service is running."""
+        import requests
+
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                print("✅ Ollama service is running")
-                return True
-            else:
-                print(f"❌ Ollama service returned status {response.status_code}")
-                return False
+            self._fetch_tags(timeout=5)
+            self._report("✅ Ollama service is running")
+            return True
+        except requests.exceptions.HTTPError as e:
+            self._report(f"❌ Ollama service returned status {e.response.status_code}")
+            return False
         except requests.exceptions.ConnectionError:
-            print("❌ Ollama service is not running")
+            self._report("❌ Ollama service is not running")
             return False
         except Exception as e:
-            print(f"❌ Error checking Ollama service: {e}")
+            self._report(f"❌ Error checking Ollama service: {e}")
             return False
 
+    def _wait_for_ready(self, timeout: float = SERVE_START_TIMEOUT) -> bool:
+        """Poll the service with growing delays until it answers or times out."""
+        import requests
+
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while True:
+            try:
+                response = self._session.get(f"{self.base_url}/api/tags", timeout=0.5)
+                if response.status_code == 200:
+                    return True
+            except requests.exceptions.RequestException:
+                pass
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.4)
+
     def get_installed_models(self) -> List[str]:
         """Get list of installed models."""
+        import requests
+
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                models = [model["name"] for model in data.get("models", [])]
-                return models
-            else:
-                print(f"❌ Failed to get models: status {response.status_code}")
-                return []
+            return self._fetch_tags()
+        except requests.exceptions.HTTPError as e:
+            print(f"❌ Failed to get models: status {e.response.status_code}")
+            return []
         except Exception as e:
             print(f"❌ Error getting models: {e}")
             return []
 
+    @staticmethod
+    def _model_installed(model_name: str, installed_models: List[str]) -> bool:
+        """Check for an exact name, treating an untagged name as ``:latest``."""
+        installed = set(installed_models)
+        installed.update(
+            name.removesuffix(":latest")
+            for name in installed_models
+            if name.endswith(":latest")
+        )
+        return model_name in installed
+
     def install_model(self, model_name: str) -> bool:
         """Install a specific model."""
         print(f"📥 Installing model: {model_name}")
 
-        if model_name in self.recommended_models:
-            model_info = self.recommended_models[model_name]
+        model_info = self.recommended_models.get(model_name)
+        if model_info is not None:
             print(f"   Size: {model_info['size']}")
             print(f"   Description: {model_info['description']}")
 
         try:
-            # Use ollama pull command
-            process = subprocess.Popen(
-                ["ollama", "pull", model_name],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-            )
-
-            print("   Progress:")
-            if process.stdout:
-                while True:
-                    output = process.stdout.readline()
-                    if output == "" and process.poll() is not None:
-                        break
-                if output:
-                    # Clean up progress output
-                    line = output.strip()
-                    if line and not line.startswith(
-                        "\x1b"
-                    ):  # Skip ANSI escape sequences
-                        print(f"   {line}")
-
-            return_code = process.poll()
-
-            if return_code == 0:
+            # Stream NDJSON progress events from the pull API
+            with self._session.post(
+                f"{self.base_url}/api/pull",
+                json={"name": model_name, "stream": True},
+                stream=True,
+                timeout=(10, None),  # Layers can take a long time to verify
+            ) as response:
+                response.raise_for_status()
+
+                print("   Progress:")
+                status = ""
+                for line in response.iter_lines(chunk_size=8192):
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    if "error" in event:
+                        print(f"❌ Failed to install {model_name}: {event['error']}")
+                        return False
+
+                    # Download events repeat per layer; report each stage once
+                    if event.get("status", status) != status:
+                        status = event["status"]
+                        total = event.get("total")
+                        size = f" ({total / 1024**3:.1f} GB)" if total else ""
+                        print(f"   {status}{size}")
+
+            if status == "success":
+                self._tags_cache = None  # List the new model on the next check
                 print(f"✅ Successfully installed {model_name}")
                 return True
             else:
-                print(f"❌ Failed to install {model_name} (exit code: {return_code})")
+                print(f"❌ Failed to install {model_name} (pull ended at: {status})")
                 return False
 
         except Exception as e:
@@ -155,9 +304,59 @@ class OllamaSetup:
             return False
 
     def test_model(self, model_name: str) -> bool:
-        """Test if a model works correctly."""
-        print(f"🧪 Testing model: {model_name}")
+        """Test if a model works correctly.
+
+        A pass is remembered on disk for MODEL_TEST_CACHE_TTL seconds and
+        reused while the installed model keeps the same digest.
+        """
+        self._report(f"🧪 Testing model: {model_name}")
 
+        try:
+            digest = self._fetch_digests().get(model_name, "")
+        except Exception:
+            digest = ""  # Unknown; test without the cache
+
+        if digest and self._cached_model_test(model_name, digest):
+            self._report(f"✅ Model {model_name} passed a recent test (cached)")
+            return True
+
+        passed = self._run_model_test(model_name)
+        if passed and digest:
+            self._store_model_test(model_name, digest)
+        return passed
+
+    def _cached_model_test(self, model_name: str, digest: str) -> bool:
+        """Check for a recent recorded pass of this exact model build."""
+        tests = read_json(_model_tests_path())
+        entry = tests.get(model_name) if isinstance(tests, dict) else None
+        if not (
+            isinstance(entry, dict)
+            and entry.get("digest") == digest
+            and entry.get("passed") is True
+        ):
+            return False
+        try:
+            age = time.time() - float(entry.get("timestamp", 0))
+        except (TypeError, ValueError):
+            return False  # Damaged entry; test again
+        return age < MODEL_TEST_CACHE_TTL
+
+    def _store_model_test(self, model_name: str, digest: str) -> None:
+        """Record a passed test; tests may finish on several threads."""
+        with self._model_tests_lock:
+            path = _model_tests_path()
+            tests = read_json(path)
+            if not isinstance(tests, dict):
+                tests = {}
+            tests[model_name] = {
+                "digest": digest,
+                "timestamp": time.time(),
+                "passed": True,
+            }
+            write_json(path, tests)
+
+    def _run_model_test(self, model_name: str) -> bool:
+        """Send the keyword extraction test prompt to the model."""
         test_prompt = (
             'Extract keywords from this text: "Catalytic conversion of '
             'nitrogen oxides to ammonia using electrochemical methods."\n\n'
@@ -168,52 +367,73 @@ class OllamaSetup:
             payload = {
                 "model": model_name,
                 "prompt": test_prompt,
-                "stream": False,
+                "stream": True,
                 "options": {"temperature": 0.1, "num_ctx": 2048},
             }
 
-            response = requests.post(
-                f"{self.base_url}/api/generate", json=payload, timeout=30
-            )
+            with self._session.post(
+                f"{self.base_url}/api/generate", json=payload, stream=True, timeout=30
+            ) as response:
+                if response.status_code != 200:
+                    self._report(f"❌ Model test failed: status {response.status_code}")
+                    return False
 
-            if response.status_code == 200:
-                result = response.json()
-                output = result.get("response", "").strip()
-
-                # Try to parse as JSON
-                try:
-                    parsed = json.loads(output)
-                    if "keywords" in parsed and isinstance(parsed["keywords"], list):
-                        print(f"✅ Model {model_name} works correctly")
-                        print(f"   Test output: {parsed['keywords']}")
-                        return True
-                    else:
-                        print(
-                            f"⚠ Model {model_name} works but output format "
-                            "needs improvement"
-                        )
-                        return True
-                except json.JSONDecodeError:
-                    print(f"⚠ Model {model_name} works but doesn't return valid JSON")
-                    print(f"   Raw output: {output[:100]}...")
-                    return True
-            else:
-                print(f"❌ Model test failed: status {response.status_code}")
-                return False
+                # Stop reading as soon as the streamed output is complete JSON
+                output = ""
+                parsed: Any = None
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    chunk = event.get("response", "")
+                    output += chunk
+                    if "}" in chunk:
+                        try:
+                            parsed = json.loads(output)
+                            break
+                        except json.JSONDecodeError:
+                            pass
+                    if event.get("done"):
+                        break
+
+            output = output.strip()
+            if parsed is None:
+                self._report(
+                    f"⚠ Model {model_name} works but doesn't return valid JSON"
+                )
+                self._report(f"   Raw output: {output[:100]}...")
+                return True
+            if isinstance(parsed, dict) and isinstance(parsed.get("keywords"), list):
+                self._report(f"✅ Model {model_name} works correctly")
+                self._report(f"   Test output: {parsed['keywords']}")
+                return True
+            self._report(
+                f"⚠ Model {model_name} works but output format needs improvement"
+            )
+            return True
 
         except Exception as e:
-            print(f"❌ Error testing model: {e}")
+            self._report(f"❌ Error testing model: {e}")
             return False
 
+    def test_models(self, model_names: List[str]) -> List[bool]:
+        """Test several models at once, returning results in the same order.
+
+        Each test waits on the server, so they run on threads sharing the
+        pooled session.
+        """
+        if not model_names:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(model_names), 8)) as executor:
+            return list(executor.map(self.test_model, model_names))
+
     def recommend_model(self) -> str:
         """Recommend the best model for the user's system."""
         print("🤔 Analyzing system for model recommendation...")
 
         # Check available disk space (simplified)
         try:
-            import shutil
-
-            free_space = shutil.disk_usage(Path.home()).free / (1024**3)  # GB
+            free_space = _home_free_gb()
             print(f"   Available disk space: {free_space:.1f} GB")
 
             if free_space < 5:
@@ -232,24 +452,31 @@ class OllamaSetup:
 
     def print_model_info(self) -> None:
         """Print information about available models."""
-        print("\n📋 Available Models for PDF Processing:")
-        print("=" * 60)
+        parts = ["\n📋 Available Models for PDF Processing:", "=" * 60]
 
         for model_name, info in self.recommended_models.items():
             status = "⭐ RECOMMENDED" if info["recommended"] else "  Alternative"
-            print(f"\n{status} {model_name}")
-            print(f"   Size: {info['size']}")
-            print(f"   Description: {info['description']}")
+            parts.append(f"\n{status} {model_name}")
+            parts.append(f"   Size: {info['size']}")
+            parts.append(f"   Description: {info['description']}")
             strengths = info.get("strengths", [])
-            if isinstance(strengths, list):
-                print(f"   Strengths: {', '.join(strengths)}")
+            if isinstance(strengths, (list, tuple)):
+                parts.append(f"   Strengths: {', '.join(strengths)}")
+
+        # One write for the whole listing
+        sys.stdout.write("\n".join(parts) + "\n")
 
     def setup_complete_system(self, model_name: Optional[str] = None) -> bool:
         """Complete setup process."""
         print("🚀 Setting up Ollama for PDF processing...")
 
+        # Steps 1 and 2 are independent, so probe both at once
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            installed = executor.submit(self.check_ollama_installed)
+            running = executor.submit(self.check_ollama_running)
+
         # Step 1: Check Ollama installation
-        if not self.check_ollama_installed():
+        if not installed.result():
             print("\n❌ Ollama is not installed. Please install it first:")
             print("   macOS: brew install ollama")
             print("   Linux: curl -fsSL https://ollama.ai/install.sh | sh")
@@ -257,7 +484,7 @@ class OllamaSetup:
             return False
 
         # Step 2: Check if service is running
-        if not self.check_ollama_running():
+        if not running.result():
             print("\n🔄 Starting Ollama service...")
             try:
                 subprocess.Popen(
@@ -265,7 +492,7 @@ class OllamaSetup:
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.DEVNULL,
                 )
-                time.sleep(3)  # Give it time to start
+                self._wait_for_ready()
 
                 if not self.check_ollama_running():
                     print("❌ Failed to start Ollama service")
@@ -286,9 +513,7 @@ class OllamaSetup:
             model_name = self.recommend_model()
 
         # Check if model is already installed
-        model_installed = any(model_name in installed for installed in installed_models)
-
-        if model_installed:
+        if self._model_installed(model_name, installed_models):
             print(f"✅ Model {model_name} is already installed")
         else:
             # Step 5: Install recommended model
@@ -328,37 +553,36 @@ def main() -> None:
 
     args = parser.parse_args()
 
-    setup = OllamaSetup()
-
-    if args.list_models:
-        setup.print_model_info()
-        return
+    with OllamaSetup() as setup:
+        if args.list_models:
+            setup.print_model_info()
+            return
 
-    if args.check_only:
-        print("🔍 Checking Ollama status...")
+        if args.check_only:
+            print("🔍 Checking Ollama status...")
 
-        installed = setup.check_ollama_installed()
-        running = setup.check_ollama_running() if installed else False
-        models = setup.get_installed_models() if running else []
+            installed = setup.check_ollama_installed(show_version=True)
+            running = setup.check_ollama_running() if installed else False
+            models = setup.get_installed_models() if running else []
 
-        print("\n📊 Status Summary:")
-        print(f"   Ollama installed: {'✅' if installed else '❌'}")
-        print(f"   Service running: {'✅' if running else '❌'}")
-        print(f"   Models available: {len(models)}")
+            print("\n📊 Status Summary:")
+            print(f"   Ollama installed: {'✅' if installed else '❌'}")
+            print(f"   Service running: {'✅' if running else '❌'}")
+            print(f"   Models available: {len(models)}")
 
-        if models:
-            print(f"   Installed models: {', '.join(models[:5])}")
-            if len(models) > 5:
-                print(f"   ... and {len(models) - 5} more")
+            if models:
+                print(f"   Installed models: {', '.join(models[:5])}")
+                if len(models) > 5:
+                    print(f"   ... and {len(models) - 5} more")
 
-        return
+            return
 
-    # Full setup
-    success = setup.setup_complete_system(args.model)
+        # Full setup
+        success = setup.setup_complete_system(args.model)
 
-    if not success:
-        print("\n💥 Setup failed. Please check the errors above.")
-        sys.exit(1)
+        if not success:
+            print("\n💥 Setup failed. Please check the errors above.")
+            sys.exit(1)
 
 
 if __name__ == "__main__":
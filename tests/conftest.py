@@ -0,0 +1,23 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+
+from scixtract.config import reset_config_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep on-disk caches out of the user's home directory."""
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("SCIXTRACT_CACHE_DIR", str(cache))
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_config():
+    """Do not let configuration loaded by one test leak into the next."""
+    reset_config_cache()
+    yield
+    reset_config_cache()
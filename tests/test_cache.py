@@ -0,0 +1,43 @@
+"""
+Tests for on-disk cache helpers.
+"""
+
+from scixtract.cache import atomic_write_text, cache_dir, read_json, write_json
+
+
+class TestCacheHelpers:
+    """Test cache helper functions."""
+
+    def test_cache_dir_override(self, tmp_path, monkeypatch):
+        """Test that SCIXTRACT_CACHE_DIR overrides the default location."""
+        monkeypatch.setenv("SCIXTRACT_CACHE_DIR", str(tmp_path))
+        assert cache_dir() == tmp_path
+
+    def test_cache_dir_default(self, monkeypatch):
+        """Test the XDG-style default location."""
+        monkeypatch.delenv("SCIXTRACT_CACHE_DIR", raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", "/tmp/xdg")
+        assert str(cache_dir()) == "/tmp/xdg/scixtract"
+
+    def test_atomic_write_text(self, tmp_path):
+        """Test atomic write creates parent directories and leaves no temp."""
+        target = tmp_path / "nested" / "file.txt"
+        atomic_write_text(target, "content")
+
+        assert target.read_text(encoding="utf-8") == "content"
+        assert list(target.parent.iterdir()) == [target]
+
+    def test_json_round_trip(self, tmp_path):
+        """Test writing and reading JSON cache files."""
+        target = tmp_path / "data.json"
+        write_json(target, {"key": ["value"]})
+
+        assert read_json(target) == {"key": ["value"]}
+
+    def test_read_json_missing_or_corrupt(self, tmp_path):
+        """Test that unreadable cache files are treated as misses."""
+        assert read_json(tmp_path / "missing.json") is None
+
+        corrupt = tmp_path / "corrupt.json"
+        corrupt.write_text("{not json", encoding="utf-8")
+        assert read_json(corrupt) is None
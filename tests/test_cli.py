@@ -2,6 +2,7 @@
 Tests for command-line interface.
 """
 
+import io
 import json
 import tempfile
 from argparse import Namespace
@@ -16,6 +17,8 @@ from scixtract.cli import (
     knowledge_command,
     main,
     save_results,
+    write_json_output,
+    write_markdown,
 )
 from scixtract.models import DocumentMetadata, ExtractionResult, PageContent
 
@@ -86,6 +89,19 @@ class TestSaveResults:
             assert keywords_data["cite_key"] == "test2024"
             assert "test" in keywords_data["keywords"]
 
+    def test_write_json_output_without_orjson(self, tmp_path):
+        """Test that JSON output is identical with the stdlib fallback."""
+        data = {"title": "Catalyse à l'échelle", "pages": [{"page_num": 1}]}
+
+        write_json_output(tmp_path / "fast.json", data)
+        with patch("scixtract.cli.HAS_ORJSON", False):
+            write_json_output(tmp_path / "stdlib.json", data)
+
+        fast = (tmp_path / "fast.json").read_text(encoding="utf-8")
+        stdlib = (tmp_path / "stdlib.json").read_text(encoding="utf-8")
+        assert json.loads(fast) == json.loads(stdlib) == data
+        assert "échelle" in stdlib
+
 
 class TestGenerateMarkdown:
     """Test markdown generation."""
@@ -176,17 +192,62 @@ class TestGenerateMarkdown:
         assert "### Page 10" in markdown
         assert "1. Smith, J. et al. (2023). Test reference." in markdown
 
+    def test_generate_markdown_keeps_blank_pages(self):
+        """Test that figure-only pages labelled blank are still rendered."""
+        result = ExtractionResult(
+            metadata=DocumentMetadata(cite_key="test2024", title="Test Paper"),
+            pages=[],
+            sections={"blank": [{"page": 4, "content": "Figure 2.", "structured": {}}]},
+            all_keywords=[],
+            key_concepts=[],
+        )
+
+        markdown = generate_markdown(result, Path("test.pdf"))
+
+        assert "## Blank" in markdown
+        assert "### Page 4\n\nFigure 2." in markdown
+
+    def test_write_markdown_matches_generate_markdown(self):
+        """Test that streamed markdown matches the in-memory rendering."""
+        result = ExtractionResult(
+            metadata=DocumentMetadata(cite_key="test2024", title="Test Paper"),
+            pages=[],
+            sections={
+                "methods": [
+                    {"page": 2, "content": "Method text", "structured": {"n": 1}}
+                ],
+                "references": [{"page": 3, "content": "Refs", "structured": {}}],
+            },
+            all_keywords=["catalyst"],
+            key_concepts=[],
+        )
+        pdf_path = Path("test.pdf")
+
+        buffer = io.StringIO()
+        write_markdown(result, pdf_path, buffer)
+
+        assert buffer.getvalue() == generate_markdown(result, pdf_path)
+
+
+@pytest.fixture
+def mock_pdf_processor(mocker):
+    """Patch AdvancedPDFProcessor with an instance whose AI is available."""
+    mock_processor_class = mocker.patch("scixtract.cli.AdvancedPDFProcessor")
+    mock_processor = Mock()
+    mock_processor.ai.available = True
+    mock_processor_class.return_value = mock_processor
+    return mock_processor_class, mock_processor
+
 
 class TestExtractCommand:
     """Test extract command functionality."""
 
-    @patch("scixtract.cli.AdvancedPDFProcessor")
     @patch("scixtract.cli.save_results")
-    def test_extract_command_success(self, mock_save_results, mock_processor_class):
+    def test_extract_command_success(
+        self, mock_save_results, mock_pdf_processor, tmp_path
+    ):
         """Test successful extract command."""
-        # Setup mocks
-        mock_processor = Mock()
-        mock_processor.ai.available = True
+        mock_processor_class, mock_processor = mock_pdf_processor
 
         metadata = DocumentMetadata(cite_key="test2024", processing_time=1.5)
         pages = [PageContent(page_num=1, raw_text="test")]
@@ -199,7 +260,6 @@ class TestExtractCommand:
         )
 
         mock_processor.process_pdf.return_value = result
-        mock_processor_class.return_value = mock_processor
 
         mock_save_results.return_value = {
             "extraction_data": Path("test_extraction.json"),
@@ -217,26 +277,19 @@ class TestExtractCommand:
             knowledge_db=None,
         )
 
-        # Create temporary PDF file
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
-            temp_pdf_path = Path(temp_pdf.name)
-
-        try:
-            args.pdf_file = str(temp_pdf_path)
-
-            # Should not raise exception
-            extract_command(args)
+        temp_pdf_path = tmp_path / "paper.pdf"
+        temp_pdf_path.touch()
+        args.pdf_file = str(temp_pdf_path)
 
-            # Verify processor was called
-            mock_processor_class.assert_called_once()
-            mock_processor.process_pdf.assert_called_once()
-            mock_save_results.assert_called_once()
+        # Should not raise exception
+        extract_command(args)
 
-        finally:
-            if temp_pdf_path.exists():
-                temp_pdf_path.unlink()
+        # Verify processor was called
+        mock_processor_class.assert_called_once()
+        mock_processor.process_pdf.assert_called_once()
+        mock_save_results.assert_called_once()
 
-    def test_extract_command_file_not_found(self):
+    def test_extract_command_file_not_found(self, mock_pdf_processor):
         """Test extract command with non-existent file."""
         args = Namespace(
             pdf_file="nonexistent.pdf",
@@ -247,15 +300,18 @@ class TestExtractCommand:
             knowledge_db=None,
         )
 
-        with pytest.raises(SystemExit):
-            extract_command(args)
+        with patch("scixtract.cli.load_config_manager") as mock_load_config:
+            with pytest.raises(SystemExit):
+                extract_command(args)
+
+        # Nothing heavy is set up for a missing file
+        mock_load_config.assert_not_called()
+        mock_pdf_processor[0].assert_not_called()
 
-    @patch("scixtract.cli.AdvancedPDFProcessor")
-    def test_extract_command_ollama_not_available(self, mock_processor_class):
+    def test_extract_command_ollama_not_available(self, mock_pdf_processor, tmp_path):
         """Test extract command when Ollama not available."""
-        mock_processor = Mock()
+        _, mock_processor = mock_pdf_processor
         mock_processor.ai.available = False
-        mock_processor_class.return_value = mock_processor
 
         args = Namespace(
             pdf_file="test.pdf",
@@ -266,30 +322,52 @@ class TestExtractCommand:
             knowledge_db=None,
         )
 
-        # Create temporary PDF file
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
-            temp_pdf_path = Path(temp_pdf.name)
+        temp_pdf_path = tmp_path / "paper.pdf"
+        temp_pdf_path.touch()
+        args.pdf_file = str(temp_pdf_path)
 
-        try:
-            args.pdf_file = str(temp_pdf_path)
+        with pytest.raises(SystemExit):
+            extract_command(args)
 
+    def test_extract_command_probes_ollama_hosts(self, tmp_path, monkeypatch):
+        """Test that OLLAMA_HOSTS backends are probed and kept by the CLI."""
+        monkeypatch.setenv("OLLAMA_HOSTS", "gpu1:11434,gpu2:11434")
+        pdf_path = tmp_path / "paper.pdf"
+        pdf_path.touch()
+        args = Namespace(
+            pdf_file=str(pdf_path),
+            model="test-model",
+            output_dir=str(tmp_path / "output"),
+            bib_file=None,
+            update_knowledge=False,
+            knowledge_db=None,
+        )
+
+        hosts = ["http://gpu1:11434", "http://gpu2:11434"]
+        check_backend = patch(
+            "scixtract.extractor.OllamaAIProcessor._check_backend", return_value=True
+        )
+        process_pdf = patch(
+            "scixtract.cli.AdvancedPDFProcessor.process_pdf",
+            autospec=True,
+            side_effect=RuntimeError("stop"),
+        )
+
+        with check_backend as mock_check, process_pdf as mock_process:
             with pytest.raises(SystemExit):
                 extract_command(args)
 
-        finally:
-            if temp_pdf_path.exists():
-                temp_pdf_path.unlink()
+        assert [call.args[0] for call in mock_check.call_args_list] == hosts
+        # Requests go to the backends that were probed
+        assert mock_process.call_args.args[0].ai.base_urls == hosts
 
-    @patch("scixtract.cli.AdvancedPDFProcessor")
     @patch("scixtract.cli.KnowledgeTracker")
     @patch("scixtract.cli.save_results")
     def test_extract_command_with_knowledge_update(
-        self, mock_save_results, mock_tracker_class, mock_processor_class
+        self, mock_save_results, mock_tracker_class, mock_pdf_processor, tmp_path
     ):
         """Test extract command with knowledge update."""
-        # Setup mocks
-        mock_processor = Mock()
-        mock_processor.ai.available = True
+        _, mock_processor = mock_pdf_processor
 
         result = ExtractionResult(
             metadata=DocumentMetadata(cite_key="test2024", processing_time=1.0),
@@ -299,7 +377,6 @@ class TestExtractCommand:
             key_concepts=[],
         )
         mock_processor.process_pdf.return_value = result
-        mock_processor_class.return_value = mock_processor
 
         mock_tracker = Mock()
         mock_tracker_class.return_value = mock_tracker
@@ -316,30 +393,21 @@ class TestExtractCommand:
             knowledge_db=None,
         )
 
-        # Create temporary files
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
-            temp_pdf_path = Path(temp_pdf.name)
+        temp_pdf_path = tmp_path / "paper.pdf"
+        temp_pdf_path.touch()
+        temp_json_path = tmp_path / "paper_extraction.json"
+        temp_json_path.write_text(json.dumps({"test": "data"}), encoding="utf-8")
 
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as temp_json:
-            temp_json_path = Path(temp_json.name)
-            json.dump({"test": "data"}, temp_json)
-
-        try:
-            args.pdf_file = str(temp_pdf_path)
-            mock_save_results.return_value = {"extraction_data": temp_json_path}
-
-            extract_command(args)
+        args.pdf_file = str(temp_pdf_path)
+        mock_save_results.return_value = {"extraction_data": temp_json_path}
 
-            # Verify knowledge tracker was used
-            mock_tracker_class.assert_called_once()
-            mock_tracker.add_extraction_result.assert_called_once()
+        extract_command(args)
 
-        finally:
-            for path in [temp_pdf_path, temp_json_path]:
-                if path.exists():
-                    path.unlink()
+        # Verify knowledge tracker was used
+        mock_tracker_class.assert_called_once()
+        mock_tracker.add_extraction_result.assert_called_once_with(
+            result.to_dict(), str(temp_pdf_path)
+        )
 
 
 class TestKnowledgeCommand:
@@ -443,6 +511,16 @@ class TestMainCLI:
 
         mock_knowledge.assert_called_once()
 
+    def test_main_config_create_example(self, tmp_path):
+        """Test writing the example TOML configuration."""
+        output = tmp_path / "scixtract.toml"
+        test_args = ["ai-pdf-extract", "config", "--create-example", "-o", str(output)]
+
+        with patch("sys.argv", test_args):
+            main()
+
+        assert "[ollama]" in output.read_text(encoding="utf-8")
+
     def test_main_no_command(self):
         """Test main CLI with no command."""
         test_args = ["ai-pdf-extract"]
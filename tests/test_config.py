@@ -0,0 +1,152 @@
+"""
+Tests for configuration management.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from scixtract.config import (
+    ConfigManager,
+    get_config,
+    load_config_manager,
+    reset_config_cache,
+)
+
+
+class TestConfigManager:
+    """Test ConfigManager class."""
+
+    def test_defaults_without_config_file(self, tmp_path, monkeypatch):
+        """Test that defaults are used when no config file exists."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("HOME", str(tmp_path))
+
+        manager = ConfigManager()
+
+        assert manager.config.ollama.model == "qwen2.5:7b"
+        assert manager.config.extraction.output_dir == "extractions"
+
+    def test_load_toml_file(self, tmp_path):
+        """Test loading settings from a TOML file."""
+        config_file = tmp_path / "scixtract.toml"
+        config_file.write_text(
+            '[ollama]\nmodel = "llama3:8b"\n\n[knowledge]\nmax_results = 5\n'
+        )
+
+        manager = ConfigManager(str(config_file))
+
+        assert manager.config.ollama.model == "llama3:8b"
+        assert manager.config.knowledge.max_results == 5
+
+    def test_config_loaded_on_first_access(self, tmp_path):
+        """Test that nothing is read until the configuration is used."""
+        manager = ConfigManager(str(tmp_path / "missing.toml"))
+
+        with pytest.raises(FileNotFoundError):
+            manager.config
+
+    def test_invalid_file_logs_warning(self, tmp_path, caplog):
+        """Test that an unparsable config file is reported and skipped."""
+        config_file = tmp_path / "scixtract.toml"
+        config_file.write_text("[ollama\nmodel = ")
+
+        manager = ConfigManager(str(config_file))
+
+        assert manager.config.ollama.model == "qwen2.5:7b"
+        assert "Could not load config file" in caplog.text
+
+    def test_environment_overrides(self, tmp_path, monkeypatch):
+        """Test that environment variables override file settings."""
+        config_file = tmp_path / "scixtract.toml"
+        config_file.write_text('[ollama]\nmodel = "llama3:8b"\ntimeout = 30\n')
+        monkeypatch.setenv("SCIXTRACT_OLLAMA_MODEL", "mistral:7b")
+        monkeypatch.setenv("SCIXTRACT_OLLAMA_TIMEOUT", "not-a-number")
+        monkeypatch.setenv("SCIXTRACT_OLLAMA_TEMPERATURE", "0.5")
+        monkeypatch.setenv("SCIXTRACT_UPDATE_KNOWLEDGE", "no")
+
+        manager = ConfigManager(str(config_file))
+
+        assert manager.config.ollama.model == "mistral:7b"
+        assert manager.config.ollama.timeout == 30  # invalid value ignored
+        assert manager.config.ollama.temperature == 0.5
+        assert manager.config.extraction.update_knowledge is False
+
+    def test_save_config_round_trip(self, tmp_path):
+        """Test that a saved configuration loads back unchanged."""
+        config_file = tmp_path / "scixtract.toml"
+        config_file.write_text("[ollama]\ntimeout = 45\n")
+        manager = ConfigManager(str(config_file))
+        manager.config.knowledge.db_path = "knowledge.db"
+        output = tmp_path / "saved.toml"
+
+        manager.save_config(str(output))
+        reloaded = ConfigManager(str(output))
+
+        assert reloaded.config.ollama.timeout == 45
+        assert reloaded.config.knowledge.db_path == "knowledge.db"
+        assert reloaded.config.extraction == manager.config.extraction
+
+    def test_save_config_skips_unset_values(self, tmp_path, monkeypatch):
+        """Test that None values are omitted, since TOML has no null."""
+        monkeypatch.chdir(tmp_path)
+        manager = ConfigManager()
+        output = tmp_path / "saved.toml"
+
+        manager.save_config(str(output))
+
+        assert "db_path" not in output.read_text()
+        assert ConfigManager(str(output)).config.knowledge.db_path is None
+
+    def test_toml_parser_not_imported_without_config_file(self, tmp_path):
+        """Test that the TOML parser is only imported when a file is loaded."""
+        code = (
+            "import sys\n"
+            "from scixtract.config import ConfigManager\n"
+            "ConfigManager()\n"
+            "assert 'tomllib' not in sys.modules, 'tomllib imported'\n"
+            "assert 'tomli' not in sys.modules, 'tomli imported'\n"
+        )
+        env = {"HOME": str(tmp_path), "PATH": ""}
+
+        completed = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=tmp_path,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+        assert completed.returncode == 0, completed.stderr
+
+
+class TestGetConfig:
+    """Test cached module-level config access."""
+
+    def test_get_config_is_cached(self, tmp_path):
+        """Test that repeated calls share one loaded configuration."""
+        config_file = tmp_path / "scixtract.toml"
+        config_file.write_text('[ollama]\nmodel = "llama3:8b"\n')
+
+        first = get_config(str(config_file))
+        config_file.write_text('[ollama]\nmodel = "mistral:7b"\n')
+
+        assert get_config(str(config_file)) is first
+        assert first.ollama.model == "llama3:8b"
+
+        reset_config_cache()
+        assert get_config(str(config_file)).ollama.model == "mistral:7b"
+
+    def test_load_config_manager_resolves_paths(self, tmp_path, monkeypatch):
+        """Test that relative and absolute paths share one manager."""
+        config_file = tmp_path / "scixtract.toml"
+        config_file.write_text('[ollama]\nmodel = "llama3:8b"\n')
+        monkeypatch.chdir(tmp_path)
+
+        first = load_config_manager(str(config_file))
+        second = load_config_manager("scixtract.toml")
+
+        assert first is second
+        assert first.config.ollama.model == "llama3:8b"
+        assert get_config("scixtract.toml") is first.config
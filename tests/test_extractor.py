@@ -7,9 +7,22 @@ from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
-
-from scixtract.extractor import AdvancedPDFProcessor, OllamaAIProcessor
-from scixtract.models import DocumentMetadata, PageContent
+import requests
+
+from scixtract.extractor import (
+    CIRCUIT_BREAKER_THRESHOLD,
+    CLASSIFY_NUM_PREDICT,
+    HAS_PYMUPDF,
+    KEYWORD_NUM_PREDICT,
+    PARALLEL_EXTRACT_MIN_PAGES,
+    AdvancedPDFProcessor,
+    OllamaAIProcessor,
+    OllamaError,
+    _bounded_join,
+    _merge_keyword_results,
+    _regex_clean,
+)
+from scixtract.models import DocumentMetadata, ExtractionResult, PageContent
 
 
 class TestOllamaAIProcessor:
@@ -19,7 +32,7 @@ class TestOllamaAIProcessor:
         """Set up test fixtures."""
         self.processor = OllamaAIProcessor("test-model")
 
-    @patch("scixtract.extractor.requests.get")
+    @patch("scixtract.extractor.requests.Session.get")
     def test_check_availability_success(self, mock_get):
         """Test successful availability check."""
         mock_response = Mock()
@@ -30,7 +43,7 @@ class TestOllamaAIProcessor:
         processor = OllamaAIProcessor("test-model")
         assert processor.available is True
 
-    @patch("scixtract.extractor.requests.get")
+    @patch("scixtract.extractor.requests.Session.get")
     def test_check_availability_failure(self, mock_get):
         """Test failed availability check."""
         mock_get.side_effect = Exception("Connection error")
@@ -38,7 +51,40 @@ class TestOllamaAIProcessor:
         processor = OllamaAIProcessor("test-model")
         assert processor.available is False
 
-    @patch("scixtract.extractor.requests.post")
+    @patch("scixtract.extractor.requests.Session.get")
+    def test_availability_probe_cached(self, mock_get):
+        """Test that a successful probe is reused by later processors."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"models": [{"name": "test-model:latest"}]}
+        mock_get.return_value = mock_response
+
+        assert OllamaAIProcessor("test-model").available is True
+
+        mock_get.reset_mock()
+        mock_get.side_effect = Exception("Connection error")
+        assert OllamaAIProcessor("test-model").available is True
+        mock_get.assert_not_called()
+
+        # A different model is probed again
+        assert OllamaAIProcessor("other-model").available is False
+
+    @patch("scixtract.extractor.requests.Session.get")
+    def test_damaged_probe_cache_probes_again(self, mock_get, isolated_cache_dir):
+        """Test that an unreadable cached probe is treated as a miss."""
+        probe_file = isolated_cache_dir / "ollama-probe.json"
+        probe_file.parent.mkdir(parents=True, exist_ok=True)
+        key = "http://localhost:11434|test-model"
+        probe_file.write_text(
+            json.dumps({key: {"available": True, "timestamp": "x"}}),
+            encoding="utf-8",
+        )
+        mock_get.side_effect = Exception("Connection error")
+
+        assert OllamaAIProcessor("test-model").available is False
+        mock_get.assert_called_once()
+
+    @patch("scixtract.extractor.requests.Session.post")
     def test_call_ollama_success(self, mock_post):
         """Test successful Ollama API call."""
         mock_response = Mock()
@@ -51,6 +97,204 @@ class TestOllamaAIProcessor:
 
         assert result == "test response"
         mock_post.assert_called_once()
+        assert mock_post.call_args.kwargs["json"]["keep_alive"] == "30m"
+
+    def test_session_uses_connection_pool(self):
+        """Test that the session mounts a pooled adapter and closes on exit."""
+        adapter = self.processor._session.get_adapter("http://localhost:11434")
+        assert adapter._pool_maxsize == 32
+
+        with patch.object(self.processor._session, "close") as mock_close:
+            with self.processor as processor:
+                assert processor is self.processor
+        mock_close.assert_called_once()
+
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_call_ollama_balances_backends(self, mock_post):
+        """Test that calls rotate across backends and skip failing ones."""
+        processor = OllamaAIProcessor(
+            "test-model", base_urls=["http://a:11434", "http://b:11434"]
+        )
+        # No server answered the availability probe in the test environment
+        processor.available = True
+        processor._retry_after.clear()
+        mock_post.return_value = Mock(
+            status_code=200, json=Mock(return_value={"response": "ok"})
+        )
+
+        processor._call_ollama("first")
+        processor._call_ollama("second")
+        urls = [call.args[0] for call in mock_post.call_args_list]
+        assert urls == [
+            "http://a:11434/api/generate",
+            "http://b:11434/api/generate",
+        ]
+
+        # A busy backend is avoided
+        processor._inflight["http://a:11434"] = 3
+        assert processor._acquire_backend() == "http://b:11434"
+        processor._inflight.clear()
+
+        # A backend that keeps failing is skipped until the cooldown passes
+        mock_post.reset_mock()
+        for _ in range(CIRCUIT_BREAKER_THRESHOLD):
+            processor._inflight["http://a:11434"] = 1
+            processor._release_backend("http://a:11434", failed=True)
+        processor._call_ollama("third")
+        processor._call_ollama("fourth")
+        urls = [call.args[0] for call in mock_post.call_args_list]
+        assert urls == ["http://b:11434/api/generate"] * 2
+
+    @patch.dict("os.environ", {"OLLAMA_HOSTS": "gpu1:11434, http://gpu2:11434/"})
+    def test_backends_from_environment(self):
+        """Test that OLLAMA_HOSTS configures several backends."""
+        processor = OllamaAIProcessor("test-model")
+        assert processor.base_urls == ["http://gpu1:11434", "http://gpu2:11434"]
+
+        # Replacing the backends probes the new one
+        with patch.object(
+            OllamaAIProcessor, "_check_backend", return_value=True
+        ) as check_backend:
+            processor.base_url = "http://other:11434"
+        assert processor.base_urls == ["http://other:11434"]
+        assert processor.available is True
+        check_backend.assert_called_once_with("http://other:11434")
+
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_warm_up_runs_once(self, mock_post):
+        """Test that warming up loads the model once per processor."""
+        mock_post.return_value = Mock(status_code=200)
+
+        self.processor.available = True
+        assert self.processor.warm_up() is True
+        assert self.processor.warm_up() is False
+
+        mock_post.assert_called_once()
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload == {"model": "test-model", "keep_alive": "30m"}
+
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_call_ollama_cached(self, mock_post):
+        """Test that identical requests are answered from the cache."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": "test response"}
+        mock_post.return_value = mock_response
+
+        self.processor.available = True
+        first = self.processor._call_ollama("test prompt")
+        second = self.processor._call_ollama("test prompt")
+        self.processor._call_ollama("other prompt")
+
+        assert first == second == "test response"
+        assert mock_post.call_count == 2
+
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_call_ollama_cache_eviction(self, mock_post):
+        """Test that the cache keeps only the most recent entries."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": "test response"}
+        mock_post.return_value = mock_response
+
+        self.processor.available = True
+        self.processor.cache_size = 1
+        self.processor.disk_cache = False
+        self.processor._call_ollama("prompt 1")
+        self.processor._call_ollama("prompt 2")
+        self.processor._call_ollama("prompt 1")
+
+        assert mock_post.call_count == 3
+        assert len(self.processor._response_cache) == 1
+
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_call_ollama_disk_cache(self, mock_post):
+        """Test that responses are reused by a new processor via the disk cache."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": "test response"}
+        mock_post.return_value = mock_response
+
+        self.processor.available = True
+        self.processor._call_ollama("test prompt")
+
+        other = OllamaAIProcessor("test-model")
+        other.available = True
+        assert other._call_ollama("test prompt") == "test response"
+        assert mock_post.call_count == 1
+
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_call_ollama_disk_cache_ttl(self, mock_post):
+        """Test that disk cache entries older than cache_ttl are not reused."""
+        mock_post.return_value = Mock(
+            status_code=200, json=Mock(return_value={"response": "test response"})
+        )
+
+        self.processor.available = True
+        self.processor._call_ollama("test prompt")
+
+        fresh = OllamaAIProcessor("test-model", cache_ttl=3600)
+        fresh.available = True
+        assert fresh._call_ollama("test prompt") == "test response"
+        assert mock_post.call_count == 1
+
+        expired = OllamaAIProcessor("test-model", cache_ttl=3600)
+        expired.available = True
+        with patch("scixtract.extractor.time.time", return_value=1e12):
+            expired._call_ollama("test prompt")
+        assert mock_post.call_count == 2
+
+    @patch("scixtract.extractor.time.sleep")
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_call_ollama_retries_transient_errors(self, mock_post, mock_sleep):
+        """Test that busy or unreachable servers are retried with backoff."""
+        mock_post.side_effect = [
+            requests.ConnectionError("refused"),
+            Mock(status_code=503),
+            Mock(status_code=200, json=Mock(return_value={"response": "ok"})),
+        ]
+
+        self.processor.available = True
+        assert self.processor._call_ollama("test prompt") == "ok"
+        assert mock_post.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch("scixtract.extractor.time.sleep")
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_unreachable_backends_forget_cached_probe(self, mock_post, mock_sleep):
+        """Test that a run which cannot connect makes the next run probe live."""
+        with patch.object(OllamaAIProcessor, "_check_backend", return_value=True):
+            processor = OllamaAIProcessor("test-model")
+        assert processor.available is True
+
+        mock_post.side_effect = requests.ConnectionError("refused")
+        with pytest.raises(OllamaError):
+            processor._call_ollama("test prompt")
+
+        with patch.object(
+            OllamaAIProcessor, "_check_backend", return_value=False
+        ) as check_backend:
+            assert OllamaAIProcessor("test-model").available is False
+        check_backend.assert_called_once()
+
+    @patch("scixtract.extractor.time.sleep")
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_call_ollama_raises_ollama_error(self, mock_post, mock_sleep):
+        """Test that failures surface as OllamaError instead of empty text."""
+        self.processor.available = True
+
+        mock_post.side_effect = requests.Timeout("timed out")
+        with pytest.raises(OllamaError, match="after 3 attempts"):
+            self.processor._call_ollama("test prompt")
+        assert mock_post.call_count == 3
+
+        # Errors that a retry cannot fix are raised immediately
+        mock_post.reset_mock()
+        mock_post.side_effect = None
+        mock_post.return_value = Mock(status_code=404)
+        with pytest.raises(OllamaError, match="HTTP 404"):
+            self.processor._call_ollama("other prompt")
+        mock_post.assert_called_once()
 
     def test_call_ollama_not_available(self):
         """Test Ollama API call when not available."""
@@ -59,7 +303,7 @@ class TestOllamaAIProcessor:
         with pytest.raises(RuntimeError, match="Ollama not available"):
             self.processor._call_ollama("test prompt")
 
-    @patch("scixtract.extractor.requests.post")
+    @patch("scixtract.extractor.requests.Session.post")
     def test_extract_keywords_and_concepts(self, mock_post):
         """Test keyword extraction."""
         mock_response = Mock()
@@ -81,10 +325,14 @@ class TestOllamaAIProcessor:
         result = self.processor.extract_keywords_and_concepts("test text")
 
         assert "technical_keywords" in result
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["format"] == "json"
+        assert payload["options"]["num_ctx"] == 2048
+        assert payload["options"]["num_predict"] == KEYWORD_NUM_PREDICT
         assert "catalysis" in result["technical_keywords"]
         assert "ammonia" in result["technical_keywords"]
 
-    @patch("scixtract.extractor.requests.post")
+    @patch("scixtract.extractor.requests.Session.post")
     def test_extract_keywords_invalid_json(self, mock_post):
         """Test keyword extraction with invalid JSON response."""
         mock_response = Mock()
@@ -99,7 +347,24 @@ class TestOllamaAIProcessor:
         assert result["technical_keywords"] == []
         assert result["research_concepts"] == []
 
-    @patch("scixtract.extractor.requests.post")
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_extract_keywords_without_orjson(self, mock_post):
+        """Test that model output is parsed with the stdlib as a fallback."""
+        responses = [json.dumps({"technical_keywords": ["catalysis"]}), "not json"]
+        mock_post.side_effect = [
+            Mock(status_code=200, json=Mock(return_value={"response": text}))
+            for text in responses
+        ]
+
+        self.processor.available = True
+        with patch("scixtract.extractor.HAS_ORJSON", False):
+            result = self.processor.extract_keywords_and_concepts("test text")
+            invalid = self.processor.extract_structured_content("x", "main", [])
+
+        assert result == {"technical_keywords": ["catalysis"]}
+        assert "extraction_error" in invalid
+
+    @patch("scixtract.extractor.requests.Session.post")
     def test_classify_content_type(self, mock_post):
         """Test content type classification."""
         mock_response = Mock()
@@ -111,8 +376,11 @@ class TestOllamaAIProcessor:
         result = self.processor.classify_content_type("test text", 1, 10)
 
         assert result == "abstract"
+        options = mock_post.call_args.kwargs["json"]["options"]
+        assert options["num_ctx"] == 2048
+        assert options["num_predict"] == CLASSIFY_NUM_PREDICT
 
-    @patch("scixtract.extractor.requests.post")
+    @patch("scixtract.extractor.requests.Session.post")
     def test_fix_text_spacing(self, mock_post):
         """Test text spacing fix."""
         mock_response = Mock()
@@ -125,6 +393,135 @@ class TestOllamaAIProcessor:
 
         assert result == "fixed text with proper spacing"
 
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_analyze_page(self, mock_post):
+        """Test fused classification and extraction in a single call."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "response": json.dumps(
+                {"content_type": "Methods", "structured": {"materials": ["Pt"]}}
+            )
+        }
+        mock_post.return_value = mock_response
+
+        self.processor.available = True
+        result = self.processor.analyze_page("Pt was used.", 2, 10, ["Pt"])
+
+        assert result == {
+            "content_type": "methods",
+            "processed_text": "Pt was used.",
+            "structured": {"materials": ["Pt"]},
+        }
+        mock_post.assert_called_once()
+        assert mock_post.call_args.kwargs["json"]["format"] == "json"
+
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_analyze_page_truncates_long_pages(self, mock_post):
+        """Test that only the start of a very long page is sent to Ollama."""
+        mock_post.return_value = Mock(
+            status_code=200,
+            json=Mock(
+                return_value={
+                    "response": json.dumps(
+                        {"content_type": "main", "structured": {"main_points": []}}
+                    )
+                }
+            ),
+        )
+
+        self.processor.available = True
+        text = "word " * 5000
+        result = self.processor.analyze_page(text, 1, 1, [])
+
+        prompt = mock_post.call_args.kwargs["json"]["prompt"]
+        assert "word " * 1600 in prompt
+        assert "word " * 1700 not in prompt
+        assert result["processed_text"] == text.strip()
+
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_analyze_page_falls_back(self, mock_post):
+        """Test that an unusable fused response falls back to per-step calls."""
+        responses = ["not json", "results", json.dumps({"key_findings": ["x"]})]
+        mock_post.side_effect = [
+            Mock(status_code=200, json=Mock(return_value={"response": text}))
+            for text in responses
+        ]
+
+        self.processor.available = True
+        result = self.processor.analyze_page("Yield was 90%.", 3, 10, [])
+
+        assert result["content_type"] == "results"
+        assert result["structured"] == {"key_findings": ["x"]}
+        assert mock_post.call_count == 3
+
+    def test_bounded_join(self):
+        """Test that the summary sample matches a truncated join."""
+        texts = ["alpha", "beta", "", "gamma"]
+        for limit in range(0, 20):
+            assert _bounded_join(texts, limit) == " ".join(texts)[:limit]
+
+    def test_regex_clean(self):
+        """Test the regex pre-pass run before the LLM spacing fix."""
+        text = "The cata-\nlyst  reduced NOx.Results at pH 7\n\n\n\nshow   gains."
+        assert _regex_clean(text) == (
+            "The catalyst reduced NOx. Results at pH 7\n\nshow gains."
+        )
+
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_fix_text_spacing_skips_blank_text(self, mock_post):
+        """Test that whitespace-only text never reaches Ollama."""
+        self.processor.available = True
+        assert self.processor.fix_text_spacing("  \n\t ") == ""
+        mock_post.assert_not_called()
+
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_fix_text_spacing_skips_clean_text(self, mock_post):
+        """Test that well-spaced text is fixed without calling Ollama."""
+        self.processor.available = True
+        text = "The catalyst was tested at 300 C and showed high activity."
+        assert self.processor.fix_text_spacing(text) == text
+        mock_post.assert_not_called()
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": "forced"}
+        mock_post.return_value = mock_response
+        assert self.processor.fix_text_spacing(text, force=True) == "forced"
+
+    @patch("scixtract.extractor.requests.Session.post")
+    def test_analyze_pages(self, mock_post):
+        """Test batched multi-page analysis."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "response": json.dumps(
+                {
+                    "pages": [
+                        {
+                            "page": 1,
+                            "keywords": ["catalysis"],
+                            "content_type": "abstract",
+                        },
+                        {"page": 2, "keywords": ["reactor"], "content_type": "methods"},
+                    ]
+                }
+            )
+        }
+        mock_post.return_value = mock_response
+
+        self.processor.available = True
+        pages = [
+            PageContent(page_num=1, raw_text="page one"),
+            PageContent(page_num=2, raw_text="page two"),
+        ]
+        result = self.processor.analyze_pages(pages, total_pages=2)
+
+        assert result[1]["content_type"] == "abstract"
+        assert result[2]["keywords"] == ["reactor"]
+        mock_post.assert_called_once()
+        assert mock_post.call_args.kwargs["json"]["format"] == "json"
+
 
 class TestAdvancedPDFProcessor:
     """Test AdvancedPDFProcessor class."""
@@ -158,6 +555,41 @@ class TestAdvancedPDFProcessor:
         assert "test2024" in processor.bib_data
         assert processor.bib_data["test2024"]["title"] == "Test Paper"
 
+    @patch("scixtract.extractor.bibtexparser")
+    @patch("scixtract.extractor.HAS_BIBTEXPARSER", True)
+    def test_load_bibliography_cached(self, mock_bibtexparser, tmp_path):
+        """Test that a parsed bibliography is reused until the file changes."""
+        mock_db = Mock()
+        mock_db.entries = [{"ID": "test2024", "title": "Test Paper"}]
+        mock_bibtexparser.load.return_value = mock_db
+
+        bib_file = tmp_path / "refs.bib"
+        bib_file.write_text("@article{test2024, title={Test Paper}}")
+
+        assert "test2024" in self.processor._load_bibliography(bib_file)
+        assert "test2024" in self.processor._load_bibliography(bib_file)
+        assert mock_bibtexparser.load.call_count == 1
+
+        bib_file.write_text("@article{test2024, title={Changed Paper}}")
+        self.processor._load_bibliography(bib_file)
+        assert mock_bibtexparser.load.call_count == 2
+
+    def test_merge_keyword_results(self):
+        """Test merging per-page keywords by frequency, ignoring case."""
+        merged = _merge_keyword_results(
+            [
+                {"technical_keywords": ["Catalysis", "zeolite"], "equipment": []},
+                {"technical_keywords": ["zeolite", "ammonia"], "other": "bad"},
+                {"technical_keywords": ["catalysis", "Zeolite", "zeolite"]},
+            ],
+            limit=2,
+        )
+
+        assert merged == {
+            "technical_keywords": ["zeolite", "Catalysis"],
+            "equipment": [],
+        }
+
     def test_get_metadata_from_bib(self):
         """Test metadata extraction from bibliography."""
         self.processor.bib_data = {
@@ -181,6 +613,22 @@ class TestAdvancedPDFProcessor:
         assert metadata.year == "2024"
         assert metadata.journal == "Test Journal"
 
+    def test_get_metadata_from_bib_strips_braces(self):
+        """Test that BibTeX braces are removed from text fields."""
+        self.processor.bib_data = {
+            "test2024": {
+                "title": "{NOx} Reduction over {Pt}",
+                "author": "{van der Berg}, J. and Doe, A.",
+                "journal": "{ACS} Catalysis",
+            }
+        }
+
+        metadata = self.processor._get_metadata_from_bib("test2024")
+
+        assert metadata.title == "NOx Reduction over Pt"
+        assert metadata.journal == "ACS Catalysis"
+        assert metadata.authors == ["van der Berg, J.", "Doe, A."]
+
     def test_get_metadata_from_bib_not_found(self):
         """Test metadata extraction for non-existent citation."""
         self.processor.bib_data = {}
@@ -213,6 +661,26 @@ class TestAdvancedPDFProcessor:
         assert pages[1].page_num == 2
         mock_doc.close.assert_called_once()
 
+    @pytest.mark.skipif(not HAS_PYMUPDF, reason="PyMuPDF not installed")
+    def test_extract_pdf_content_parallel(self, tmp_path):
+        """Test that large documents are extracted in page order by workers."""
+        import fitz
+
+        pdf_path = tmp_path / "long.pdf"
+        doc = fitz.open()
+        for i in range(PARALLEL_EXTRACT_MIN_PAGES + 3):
+            doc.new_page().insert_text((72, 72), f"Page number {i + 1}")
+        doc.save(pdf_path)
+        doc.close()
+
+        with patch("scixtract.extractor.os.cpu_count", return_value=4):
+            pages = self.processor.extract_pdf_content(pdf_path)
+
+        assert len(pages) == PARALLEL_EXTRACT_MIN_PAGES + 3
+        for i, page in enumerate(pages, 1):
+            assert page.page_num == i
+            assert page.raw_text.strip() == f"Page number {i}"
+
     @patch("scixtract.extractor.HAS_PYMUPDF", False)
     def test_extract_pdf_content_no_pymupdf(self):
         """Test PDF extraction without PyMuPDF."""
@@ -244,15 +712,17 @@ class TestAdvancedPDFProcessor:
                 "equipment": ["instrument1"],
             }
         )
-        self.processor.ai.fix_text_spacing = Mock(return_value="fixed text")
-        self.processor.ai.classify_content_type = Mock(return_value="abstract")
-        self.processor.ai.extract_structured_content = Mock(
-            return_value={"objective": "test objective"}
+        self.processor.ai.analyze_page = Mock(
+            return_value={
+                "content_type": "abstract",
+                "processed_text": "fixed text",
+                "structured": {"objective": "test objective"},
+            }
         )
 
         pages = [
-            PageContent(page_num=1, raw_text="test text 1"),
-            PageContent(page_num=2, raw_text="test text 2"),
+            PageContent(page_num=1, raw_text="test text 1 " * 20),
+            PageContent(page_num=2, raw_text="test text 2 " * 20),
         ]
         metadata = DocumentMetadata(cite_key="test2024")
 
@@ -265,9 +735,176 @@ class TestAdvancedPDFProcessor:
         assert "keyword" in result.all_keywords
 
         # Check that AI methods were called
-        self.processor.ai.extract_keywords_and_concepts.assert_called_once()
-        assert self.processor.ai.fix_text_spacing.call_count == 2
-        assert self.processor.ai.classify_content_type.call_count == 2
+        assert self.processor.ai.extract_keywords_and_concepts.call_count == 2
+        assert self.processor.ai.analyze_page.call_count == 2
+        assert self.processor.ai.analyze_page.call_args.kwargs[
+            "keyword_context"
+        ].startswith("Key terms to focus on: test, keyword")
+        assert result.pages[0].processed_text == "fixed text"
+        assert [item["page"] for item in result.sections["abstract"]] == [1, 2]
+
+    def test_process_with_ai_keeps_page_order(self):
+        """Test that concurrent page processing keeps sections in page order."""
+        self.processor.ai.available = True
+        self.processor.max_workers = 4
+        self.processor.ai.extract_keywords_and_concepts = Mock(return_value={})
+        self.processor.ai.analyze_page = Mock(
+            side_effect=lambda text, page_num, total_pages, keywords, **kwargs: {
+                "content_type": "main",
+                "processed_text": text,
+                "structured": {"text": text},
+            }
+        )
+
+        pages = [
+            PageContent(page_num=i, raw_text=f"page {i} " * 40) for i in range(1, 9)
+        ]
+        metadata = DocumentMetadata(cite_key="test2024")
+
+        result = self.processor.process_with_ai(pages, metadata)
+
+        assert [item["page"] for item in result.sections["main"]] == list(range(1, 9))
+        assert [item["structured"]["text"] for item in result.sections["main"]] == [
+            f"page {i} " * 40 for i in range(1, 9)
+        ]
+
+    def test_process_with_ai_skips_blank_and_reference_pages(self):
+        """Test that blank and reference pages are labelled without Ollama."""
+        self.processor.ai.available = True
+        self.processor.ai.extract_keywords_and_concepts = Mock(return_value={})
+        self.processor.ai.analyze_page = Mock(
+            return_value={
+                "content_type": "results",
+                "processed_text": "body",
+                "structured": {"key_findings": []},
+            }
+        )
+
+        references = "".join(
+            f"[{i}] A. Author, Some title, J. Catal. ({2000 + i}) 1-10.\n"
+            for i in range(12)
+        )
+        pages = [
+            PageContent(page_num=1, raw_text="Results and discussion. " * 20),
+            PageContent(page_num=2, raw_text="Figure 3"),
+            PageContent(page_num=3, raw_text=references),
+        ]
+        metadata = DocumentMetadata(cite_key="test2024")
+
+        result = self.processor.process_with_ai(pages, metadata)
+
+        assert self.processor.ai.analyze_page.call_count == 1
+        assert [page.content_type for page in result.pages] == [
+            "results",
+            "blank",
+            "references",
+        ]
+        assert result.sections["references"][0]["structured"] == {}
+
+    def test_process_with_ai_batched(self):
+        """Test batched AI processing with several pages per call."""
+        self.processor.ai.available = True
+        self.processor.ai.analyze_pages = Mock(
+            side_effect=[
+                {
+                    1: {
+                        "keywords": ["catalysis"],
+                        "concepts": ["conversion"],
+                        "content_type": "abstract",
+                        "structured": {"objective": "test"},
+                    },
+                    2: {"keywords": ["catalysis", "NH3"], "content_type": "Methods"},
+                },
+                {3: {"content_type": "figure legend"}},
+            ]
+        )
+
+        pages = [
+            PageContent(page_num=1, raw_text="test text 1"),
+            PageContent(page_num=2, raw_text="test text 2"),
+            PageContent(page_num=3, raw_text="test text 3"),
+        ]
+        metadata = DocumentMetadata(cite_key="test2024")
+
+        result = self.processor.process_with_ai_batched(
+            pages, metadata, pages_per_call=2
+        )
+
+        assert self.processor.ai.analyze_pages.call_count == 2
+        assert result.all_keywords == ["catalysis", "NH3"]
+        assert result.key_concepts == ["conversion"]
+        assert pages[0].content_type == "abstract"
+        assert pages[1].content_type == "methods"
+        assert pages[2].content_type == "main"  # Unknown labels fall back
+        assert "extraction_error" in result.sections["main"][0]["structured"]
+
+    def test_process_pdf_uses_result_cache(self, tmp_path):
+        """Test that an unchanged PDF is answered from the result cache."""
+        pdf_path = tmp_path / "cached2024.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4 cached")
+
+        self.processor.ai.model = "test-model"
+        self.processor.extract_pdf_content = Mock(
+            return_value=[PageContent(page_num=1, raw_text="text")]
+        )
+        self.processor.process_with_ai = Mock(
+            side_effect=lambda pages, metadata, checkpoint_path=None: ExtractionResult(
+                metadata=metadata,
+                pages=pages,
+                sections={"main": []},
+                all_keywords=["catalysis"],
+                key_concepts=[],
+            )
+        )
+
+        first = self.processor.process_pdf(pdf_path)
+        second = self.processor.process_pdf(pdf_path)
+
+        assert self.processor.process_with_ai.call_count == 1
+        assert second.to_dict() == first.to_dict()
+
+        # Changed contents miss the cache
+        pdf_path.write_bytes(b"%PDF-1.4 changed")
+        self.processor.process_pdf(pdf_path)
+        assert self.processor.process_with_ai.call_count == 2
+
+    def test_process_with_ai_resumes_from_checkpoint(self, tmp_path):
+        """Test that pages finished before a failure are not analyzed again."""
+        checkpoint_path = tmp_path / "doc.jsonl"
+        self.processor.ai.available = True
+        self.processor.max_workers = 1
+        self.processor.ai.extract_keywords_and_concepts = Mock(return_value={})
+
+        def analyze(text, page_num, total_pages, keywords, **kwargs):
+            if page_num == 3 and fail:
+                raise OllamaError("Ollama returned HTTP 500")
+            return {
+                "content_type": "main",
+                "processed_text": text,
+                "structured": {"page": page_num},
+            }
+
+        self.processor.ai.analyze_page = Mock(side_effect=analyze)
+        pages = [
+            PageContent(page_num=i, raw_text=f"page {i} " * 40) for i in range(1, 4)
+        ]
+        metadata = DocumentMetadata(cite_key="test2024")
+
+        fail = True
+        with pytest.raises(OllamaError):
+            self.processor.process_with_ai(pages, metadata, checkpoint_path)
+        assert len(checkpoint_path.read_text().splitlines()) == 2
+
+        fail = False
+        self.processor.ai.analyze_page.reset_mock()
+        result = self.processor.process_with_ai(pages, metadata, checkpoint_path)
+
+        self.processor.ai.analyze_page.assert_called_once()
+        assert [item["structured"]["page"] for item in result.sections["main"]] == [
+            1,
+            2,
+            3,
+        ]
 
 
 class TestIntegration:
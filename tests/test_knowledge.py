@@ -4,9 +4,12 @@ Tests for knowledge tracking functionality.
 
 import sqlite3
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import pytest
+
 from scixtract.knowledge import KnowledgeTracker
 
 
@@ -22,6 +25,7 @@ class TestKnowledgeTracker:
 
     def teardown_method(self):
         """Clean up test fixtures."""
+        self.tracker.close()
         if self.db_path.exists():
             self.db_path.unlink()
 
@@ -119,6 +123,170 @@ class TestKnowledgeTracker:
 
         conn.close()
 
+    def test_add_extraction_result_builds_concept_network(self):
+        """Test that pages, keywords and co-occurrences are stored together."""
+        result_data = {
+            "metadata": {"cite_key": "net2024"},
+            "pages": [
+                {"page_num": 1, "keywords": ["a", "b"], "processed_text": "a b"},
+                {"page_num": 2, "keywords": ["a", "b", "c"], "processed_text": "abc"},
+            ],
+        }
+
+        self.tracker.add_extraction_result(result_data, "/path/to/net.pdf")
+        self.tracker.add_extraction_result(result_data, "/path/to/net.pdf")
+
+        conn = sqlite3.connect(self.db_path)
+        counts = conn.execute(
+            """
+            SELECT (SELECT COUNT(*) FROM pages), (SELECT COUNT(*) FROM keywords),
+                   (SELECT COUNT(*) FROM concept_network)
+        """
+        ).fetchone()
+        pairs = conn.execute(
+            "SELECT concept, related_concept, co_occurrence_count "
+            "FROM concept_network ORDER BY concept, related_concept"
+        ).fetchall()
+        conn.close()
+
+        # Re-adding a document replaces its rows
+        assert counts == (2, 5, 3)
+        # Pairs are counted by the pages they share
+        assert pairs == [("a", "b", 2), ("a", "c", 1), ("b", "c", 1)]
+
+    def test_keyword_frequency_is_case_insensitive(self):
+        """Test that keyword occurrences are counted regardless of case."""
+        result_data = {
+            "metadata": {"cite_key": "freq2024"},
+            "pages": [
+                {
+                    "page_num": 1,
+                    "keywords": ["NH3", "C++", "zeolite"],
+                    "processed_text": "NH3 and nh3 (NH3) with C++ code.",
+                }
+            ],
+        }
+
+        self.tracker.add_extraction_result(result_data, "/path/to/freq.pdf")
+
+        conn = sqlite3.connect(self.db_path)
+        rows = {
+            keyword: (frequency, context)
+            for keyword, frequency, context in conn.execute(
+                "SELECT keyword, frequency, context FROM keywords"
+            )
+        }
+        conn.close()
+
+        assert rows == {
+            "nh3": (3, "NH3 and nh3 (NH3) with C++ code."),
+            "c++": (1, "NH3 and nh3 (NH3) with C++ code."),
+            "zeolite": (0, ""),
+        }
+
+    def test_batch_commits_once(self):
+        """Test that writes inside batch() land together on exit."""
+        result_data = {
+            "metadata": {"cite_key": "batch2024", "title": "Batched Paper"},
+            "pages": [
+                {
+                    "page_num": 1,
+                    "keywords": ["catalysis"],
+                    "processed_text": "Catalysis in a batch.",
+                }
+            ],
+        }
+
+        with self.tracker.batch():
+            self.tracker.add_extraction_result(result_data, "/path/to/batch.pdf")
+
+            # Not yet visible to other connections
+            conn = sqlite3.connect(self.db_path)
+            assert conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 0
+            conn.close()
+
+        assert self.tracker.get_document_stats()["document_count"] == 1
+
+    def test_batch_rolls_back_on_error(self):
+        """Test that a failing batch leaves the database untouched."""
+        result_data = {"metadata": {"cite_key": "fail2024"}, "pages": []}
+
+        with pytest.raises(RuntimeError):
+            with self.tracker.batch():
+                self.tracker.add_extraction_result(result_data, "/path/to/fail.pdf")
+                raise RuntimeError("boom")
+
+        assert self.tracker.get_document_stats()["document_count"] == 0
+
+    def test_batch_discards_failed_document_only(self):
+        """Test that a document failing mid-write leaves no rows in a batch."""
+        good = {"metadata": {"cite_key": "good2024"}, "pages": [{"page_num": 1}]}
+        bad = {"metadata": {"cite_key": "bad2024"}, "pages": [{"page_num": 1}]}
+
+        with self.tracker.batch():
+            self.tracker.add_extraction_result(good, "/path/to/good.pdf")
+            with patch.object(
+                KnowledgeTracker,
+                "_build_concept_network",
+                side_effect=sqlite3.OperationalError("disk I/O error"),
+            ), pytest.raises(sqlite3.OperationalError):
+                self.tracker.add_extraction_result(bad, "/path/to/bad.pdf")
+
+        conn = sqlite3.connect(self.db_path)
+        assert conn.execute("SELECT cite_key FROM documents").fetchall() == [
+            ("good2024",)
+        ]
+        assert conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0] == 1
+        conn.close()
+
+    @pytest.mark.parametrize("min_documents", [100, 2])
+    def test_add_extraction_results(self, min_documents):
+        """Test bulk ingestion, sequential and with worker processes."""
+        results = [
+            (
+                {
+                    "metadata": {"cite_key": f"doc{i}", "authors": ["Smith, J."]},
+                    "pages": [
+                        {
+                            "page_num": 1,
+                            "keywords": ["zeolite", "ammonia"],
+                            "processed_text": "Zeolite and ammonia, zeolite again.",
+                        }
+                    ],
+                },
+                f"/path/to/doc{i}.pdf",
+            )
+            for i in range(3)
+        ]
+
+        with patch(
+            "scixtract.knowledge.PARALLEL_PREPARE_MIN_DOCUMENTS", min_documents
+        ), patch("scixtract.knowledge.os.cpu_count", return_value=2):
+            self.tracker.add_extraction_results(results, max_workers=2)
+
+        stats = self.tracker.get_document_stats()
+        assert stats["document_count"] == 3
+        assert sorted(stats["top_keywords"]) == [("ammonia", 3), ("zeolite", 3)]
+        assert stats["top_authors"] == [("Smith, J.", 3)]
+
+    def test_persistent_connection_uses_wal(self):
+        """Test that the tracker reuses one tuned connection per thread."""
+        with self.tracker._connect() as first, self.tracker._connect() as second:
+            assert first is second
+            assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        # Another thread gets its own connection
+        other = []
+        thread = threading.Thread(target=lambda: other.append(self.tracker._get_conn()))
+        thread.start()
+        thread.join()
+        assert other[0] is not first
+
+        self.tracker.close()
+        assert self.tracker._connections == []
+        # The tracker reopens a connection on next use
+        assert self.tracker.get_document_stats()["document_count"] == 0
+
     def test_extract_keyword_context(self):
         """Test keyword context extraction."""
         text = (
@@ -130,6 +298,14 @@ class TestKnowledgeTracker:
         assert "catalysis" in context
         assert len(context) <= 100  # Should be around context_length
 
+        # A precomputed lowercase copy gives the same result
+        assert (
+            self.tracker._extract_keyword_context(
+                "Catalysis", text, 50, text_lower=text.lower()
+            )
+            == context
+        )
+
     def test_search_keywords_empty_db(self):
         """Test keyword search on empty database."""
         results = self.tracker.search_keywords("test")
@@ -175,6 +351,82 @@ class TestKnowledgeTracker:
         assert results[0]["keyword"] == "catalysis"
         assert "catalysis" in results[0]["context"]
 
+    def _add_search_documents(self):
+        """Add two documents for the search tests."""
+        for cite_key, keywords, text in [
+            (
+                "cat2024",
+                ["heterogeneous catalysis", "zeolite"],
+                "Heterogeneous catalysis over a zeolite support.",
+            ),
+            (
+                "nh3_2024",
+                ["ammonia"],
+                "Ammonia was formed without any catalysts present.",
+            ),
+        ]:
+            self.tracker.add_extraction_result(
+                {
+                    "metadata": {"cite_key": cite_key, "title": cite_key},
+                    "pages": [
+                        {"page_num": 1, "keywords": keywords, "processed_text": text}
+                    ],
+                },
+                f"/path/to/{cite_key}.pdf",
+            )
+
+    def test_search_keywords_full_text(self):
+        """Test prefix matching on keywords and their context."""
+        assert self.tracker.has_fts
+        self._add_search_documents()
+
+        results = self.tracker.search_keywords("catal")
+
+        assert [r["keyword"] for r in results][:1] == ["heterogeneous catalysis"]
+        assert {r["cite_key"] for r in results} == {"cat2024", "nh3_2024"}
+        assert self.tracker.search_keywords("!!!") == []
+
+    def test_search_keywords_without_fts(self):
+        """Test the prefix fallback used when SQLite lacks FTS5."""
+        self._add_search_documents()
+        self.tracker.has_fts = False
+
+        results = self.tracker.search_keywords("Hetero")
+
+        assert [r["keyword"] for r in results] == ["heterogeneous catalysis"]
+        assert self.tracker.search_keywords("catal") == []
+
+        # The range scan is served entirely from the covering index
+        with self.tracker._connect() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT keyword, frequency FROM keywords "
+                "WHERE keyword >= 'a' AND keyword < 'b'"
+            ).fetchall()
+        assert "COVERING INDEX idx_keywords_search" in plan[0][-1]
+
+    def test_document_rows_deleted_by_index(self):
+        """Test that replacing a document does not scan the whole tables."""
+        with self.tracker._connect() as conn:
+            for table in ("pages", "keywords", "concept_network"):
+                plan = conn.execute(
+                    f"EXPLAIN QUERY PLAN DELETE FROM {table} WHERE cite_key = 'x'"
+                ).fetchall()
+                assert "idx_" in plan[0][-1], table
+
+    def test_fts_index_rebuilt_for_existing_database(self):
+        """Test that keywords stored before the FTS table existed are indexed."""
+        self._add_search_documents()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DROP TABLE keywords_fts")
+        conn.commit()
+        conn.close()
+
+        tracker = KnowledgeTracker(self.db_path)
+
+        results = tracker.search_keywords("zeolite")
+        assert results[0]["keyword"] == "zeolite"
+        assert {r["cite_key"] for r in results} == {"cat2024"}
+
     def test_get_document_stats_empty(self):
         """Test statistics on empty database."""
         stats = self.tracker.get_document_stats()
@@ -236,6 +488,49 @@ class TestKnowledgeTracker:
         assert ("Smith, J.", 1) in stats["top_authors"]
         assert ("Doe, A.", 1) in stats["top_authors"]
 
+    def test_get_document_stats_ranks_authors(self):
+        """Test that authors are counted across documents, most prolific first."""
+        for cite_key, authors in [
+            ("a2024", ["Smith, J.", "Doe, A."]),
+            ("b2024", ["Smith, J."]),
+            ("c2024", []),
+        ]:
+            self.tracker.add_extraction_result(
+                {"metadata": {"cite_key": cite_key, "authors": authors}, "pages": []},
+                f"/path/to/{cite_key}.pdf",
+            )
+
+        stats = self.tracker.get_document_stats()
+
+        assert stats["top_authors"] == [("Smith, J.", 2), ("Doe, A.", 1)]
+
+    def test_get_related_concepts_from_both_sides(self):
+        """Test that a pair is found whichever keyword is looked up."""
+        result_data = {
+            "metadata": {"cite_key": "pair2024"},
+            "pages": [
+                {
+                    "page_num": 1,
+                    "keywords": ["zeolite", "ammonia", "catalysis"],
+                    "processed_text": "Zeolite catalysis of ammonia.",
+                }
+            ],
+        }
+        self.tracker.add_extraction_result(result_data, "/path/to/pair.pdf")
+
+        assert self.tracker.get_related_concepts("zeolite") == [
+            ("ammonia", 1),
+            ("catalysis", 1),
+        ]
+        assert self.tracker.get_related_concepts("catalysis") == [
+            ("ammonia", 1),
+            ("zeolite", 1),
+        ]
+        assert self.tracker.get_related_concepts("ammonia") == [
+            ("catalysis", 1),
+            ("zeolite", 1),
+        ]
+
     def test_get_related_concepts_empty(self):
         """Test related concepts on empty database."""
         results = self.tracker.get_related_concepts("test")
@@ -296,6 +591,7 @@ class TestKnowledgeTracker:
             assert "metadata" in graph_data
             assert isinstance(graph_data["nodes"], list)
             assert isinstance(graph_data["edges"], list)
+            assert graph_data["metadata"]["node_count"] == len(graph_data["nodes"])
 
         finally:
             if output_path.exists():
@@ -2,6 +2,8 @@
 Tests for data models.
 """
 
+from dataclasses import fields
+
 from scixtract.models import (
     ConceptNetwork,
     DocumentIndex,
@@ -58,6 +60,17 @@ class TestDocumentMetadata:
         assert result["year"] == "2024"
         assert "extraction_date" in result
 
+    def test_to_dict_covers_all_fields(self):
+        """Test that to_dict() keeps every field and copies the lists."""
+        metadata = DocumentMetadata(cite_key="test2024", authors=["Smith, J."])
+
+        result = metadata.to_dict()
+
+        assert list(result) == [f.name for f in fields(DocumentMetadata)]
+        result["authors"].append("Doe, A.")
+        assert metadata.authors == ["Smith, J."]
+        assert not hasattr(metadata, "__dict__")
+
 
 class TestPageContent:
     """Test PageContent model."""
@@ -106,6 +119,7 @@ class TestPageContent:
         assert result["page_num"] == 1
         assert result["raw_text"] == "Test text"
         assert result["content_type"] == "methods"
+        assert list(result) == [f.name for f in fields(PageContent)]
 
 
 class TestExtractionResult:
@@ -160,6 +174,21 @@ class TestExtractionResult:
         assert isinstance(result_dict["pages"], list)
         assert isinstance(result_dict["pages"][0], dict)
 
+    def test_from_dict_round_trip(self):
+        """Test that from_dict() restores a result produced by to_dict()."""
+        result = ExtractionResult(
+            metadata=DocumentMetadata(cite_key="test2024", authors=["Smith, J."]),
+            pages=[PageContent(page_num=1, raw_text="Test", keywords=["test"])],
+            sections={"main": [{"page": 1, "content": "Test", "structured": {}}]},
+            all_keywords=["test"],
+            key_concepts=["concept"],
+            conclusions="Works",
+        )
+
+        restored = ExtractionResult.from_dict(result.to_dict())
+
+        assert restored == result
+
 
 class TestDocumentIndex:
     """Test DocumentIndex model."""
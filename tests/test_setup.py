@@ -0,0 +1,292 @@
+"""
+Tests for Ollama setup utilities.
+"""
+
+import json
+import subprocess
+import sys
+import threading
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+import requests
+
+from scixtract.setup import TAGS_CACHE_TTL, OllamaSetup, _home_free_gb
+
+
+def _tags_response(*names, digest="sha256:abc"):
+    """Build a mock /api/tags response listing the given models."""
+    data = {"models": [{"name": name, "digest": digest} for name in names]}
+    response = Mock(status_code=200, content=json.dumps(data).encode())
+    response.json.return_value = data
+    return response
+
+
+def _generate_response(*chunks, status_code=200):
+    """Build a mock streaming /api/generate response from output chunks."""
+    response = MagicMock(status_code=status_code)
+    response.__enter__.return_value = response
+    response.iter_lines.return_value = [
+        json.dumps({"response": chunk, "done": False}).encode() for chunk in chunks
+    ] + [b'{"response": "", "done": true}']
+    return response
+
+
+class TestOllamaSetup:
+    """Test OllamaSetup class."""
+
+    def test_session_reused_for_requests(self):
+        """Test that HTTP calls go through one pooled session."""
+        with OllamaSetup() as setup:
+            assert isinstance(setup._session, requests.Session)
+            with patch.object(
+                setup._session, "get", return_value=_tags_response("mistral")
+            ) as mock_get:
+                assert setup.check_ollama_running()
+
+            mock_get.assert_called_once()
+
+    def test_tags_cached_between_checks(self):
+        """Test that /api/tags is fetched once within the TTL."""
+        setup = OllamaSetup()
+        with patch.object(
+            setup._session, "get", return_value=_tags_response("mistral")
+        ) as mock_get:
+            assert setup.check_ollama_running()
+            assert setup.get_installed_models() == ["mistral"]
+            assert mock_get.call_count == 1
+
+            # Expired or invalidated listings are fetched again
+            setup._tags_cache = (setup._tags_cache[0] - TAGS_CACHE_TTL, {"old": ""})
+            assert setup.get_installed_models() == ["mistral"]
+            setup._tags_cache = None
+            assert setup.get_installed_models() == ["mistral"]
+            assert mock_get.call_count == 3
+
+    def test_check_ollama_running_bad_status(self):
+        """Test that a failing status is reported and not cached."""
+        setup = OllamaSetup()
+        response = Mock(status_code=500)
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=response
+        )
+        with patch.object(setup._session, "get", return_value=response):
+            assert not setup.check_ollama_running()
+            assert setup.get_installed_models() == []
+        assert setup._tags_cache is None
+
+    def test_install_model_streams_progress(self, capsys):
+        """Test that pull progress is read from the streaming API."""
+        events = [
+            {"status": "pulling manifest"},
+            {"status": "pulling abc123", "total": 2 * 1024**3, "completed": 0},
+            {"status": "pulling abc123", "total": 2 * 1024**3, "completed": 1},
+            {"status": "verifying sha256 digest"},
+            {"status": "success"},
+        ]
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_lines.return_value = [json.dumps(e).encode() for e in events]
+
+        setup = OllamaSetup()
+        setup._tags_cache = (0.0, {})
+        with patch.object(setup._session, "post", return_value=response) as post:
+            assert setup.install_model("mistral")
+
+        assert post.call_args.kwargs["json"] == {"name": "mistral", "stream": True}
+        output = capsys.readouterr().out
+        assert (
+            "   pulling manifest\n   pulling abc123 (2.0 GB)\n"
+            "   verifying sha256 digest\n   success\n"
+        ) in output
+        assert setup._tags_cache is None
+
+    def test_install_model_reports_pull_error(self):
+        """Test that an error event from the pull API fails the install."""
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_lines.return_value = [b'{"error": "model not found"}']
+
+        setup = OllamaSetup()
+        with patch.object(setup._session, "post", return_value=response):
+            assert not setup.install_model("missing")
+
+    def test_setup_probes_installation_and_service_together(self):
+        """Test that both probes run before the setup inspects either result."""
+        setup = OllamaSetup()
+        with patch.object(
+            setup, "check_ollama_installed", return_value=False
+        ), patch.object(setup, "check_ollama_running", return_value=True) as running:
+            assert not setup.setup_complete_system("mistral")
+
+        running.assert_called_once()
+
+    def test_wait_for_ready_polls_until_service_answers(self):
+        """Test that startup polling returns as soon as the service is up."""
+        setup = OllamaSetup()
+        responses = [requests.exceptions.ConnectionError(), Mock(status_code=200)]
+        with patch.object(setup._session, "get", side_effect=responses), patch(
+            "scixtract.setup.time.sleep"
+        ) as sleep:
+            assert setup._wait_for_ready()
+        sleep.assert_called_once_with(0.05)
+
+        with patch.object(
+            setup._session, "get", side_effect=requests.exceptions.ConnectionError
+        ):
+            assert not setup._wait_for_ready(timeout=0.1)
+
+    def test_check_ollama_installed_uses_path_lookup(self):
+        """Test that install detection needs no subprocess unless asked."""
+        setup = OllamaSetup()
+        with patch("scixtract.setup.subprocess.run") as run, patch(
+            "scixtract.setup.shutil.which", return_value=None
+        ):
+            assert not setup.check_ollama_installed(show_version=True)
+        run.assert_not_called()
+
+        with patch("scixtract.setup.subprocess.run") as run, patch(
+            "scixtract.setup.shutil.which", return_value="/usr/bin/ollama"
+        ):
+            assert setup.check_ollama_installed()
+            run.assert_not_called()
+
+            run.return_value = Mock(returncode=0, stdout="ollama version 0.5.0\n")
+            assert setup.check_ollama_installed(show_version=True)
+            run.assert_called_once()
+
+    def test_recommended_models_shared_and_read_only(self, capsys):
+        """Test that instances share one immutable model table."""
+        setup = OllamaSetup()
+        assert setup.recommended_models is OllamaSetup().recommended_models
+        with pytest.raises(TypeError):
+            setup.recommended_models["mistral"]["size"] = "1GB"
+
+        setup.print_model_info()
+        assert (
+            "Strengths: Speed, Efficiency, Good JSON output" in capsys.readouterr().out
+        )
+
+    def test_model_installed_matches_exact_names(self):
+        """Test that model lookup does not match on substrings."""
+        installed = ["qwen2.5:7b-chat", "mistral:latest"]
+
+        assert not OllamaSetup._model_installed("qwen2.5:7b", installed)
+        assert OllamaSetup._model_installed("qwen2.5:7b-chat", installed)
+        assert OllamaSetup._model_installed("mistral", installed)
+        assert OllamaSetup._model_installed("mistral:latest", installed)
+
+    def test_recommend_model_measures_disk_once(self):
+        """Test that free disk space is looked up once per process."""
+        _home_free_gb.cache_clear()
+        usage = Mock(free=30 * 1024**3)
+        setup = OllamaSetup()
+        with patch("scixtract.setup.shutil.disk_usage", return_value=usage) as disk:
+            assert setup.recommend_model() == "qwen2.5:32b-instruct-q4_K_M"
+            assert setup.recommend_model() == "qwen2.5:32b-instruct-q4_K_M"
+        _home_free_gb.cache_clear()
+
+        disk.assert_called_once()
+
+    def test_get_installed_models_without_orjson(self):
+        """Test that the tag listing parses the same with the stdlib fallback."""
+        setup = OllamaSetup()
+        with patch.object(
+            setup._session, "get", return_value=_tags_response("mistral", "qwen2:72b")
+        ), patch("scixtract.setup.HAS_ORJSON", False):
+            assert setup.get_installed_models() == ["mistral", "qwen2:72b"]
+
+    def test_test_models_runs_concurrently(self):
+        """Test that several model tests share the executor and keep order."""
+        setup = OllamaSetup()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def generate(url, json, stream, timeout):
+            barrier.wait()  # Both requests must be in flight together
+            if json["model"] == "broken":
+                return _generate_response(status_code=500)
+            return _generate_response('{"keywords": ["ammonia"]}')
+
+        with patch.object(setup._session, "post", side_effect=generate):
+            assert setup.test_models(["mistral", "broken"]) == [True, False]
+        assert setup.test_models([]) == []
+
+    def test_test_model_stops_at_first_complete_json(self, capsys):
+        """Test that the streamed test output is parsed as soon as it is valid."""
+        setup = OllamaSetup()
+        response = _generate_response('{"keywords": ', '["ammonia"]}', "ignored")
+        lines = iter(response.iter_lines.return_value)
+        response.iter_lines.return_value = lines
+        with patch.object(setup._session, "post", return_value=response) as post:
+            assert setup.test_model("mistral")
+
+        assert post.call_args.kwargs["json"]["stream"] is True
+        assert "Test output: ['ammonia']" in capsys.readouterr().out
+        # The rest of the stream is never read
+        assert len(list(lines)) == 2
+
+        response = _generate_response("no json here")
+        with patch.object(setup._session, "post", return_value=response):
+            assert setup.test_model("mistral")
+        assert "doesn't return valid JSON" in capsys.readouterr().out
+
+    def test_list_models_does_not_import_requests(self):
+        """Test that listing models needs no HTTP stack."""
+        code = (
+            "import sys; from scixtract.setup import OllamaSetup; "
+            "OllamaSetup().print_model_info(); "
+            "sys.exit('requests' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True)
+        assert result.returncode == 0, result.stderr
+
+        setup = OllamaSetup()
+        assert setup._http is None
+        assert setup._session is setup._session
+        setup.close()
+        assert setup._http is None
+
+    def test_test_model_reuses_recent_pass(self, isolated_cache_dir):
+        """Test that a passed test is skipped while the model is unchanged."""
+        setup = OllamaSetup()
+        with patch.object(
+            setup._session, "get", return_value=_tags_response("mistral")
+        ), patch.object(
+            setup._session,
+            "post",
+            side_effect=lambda *a, **kw: _generate_response('{"keywords": []}'),
+        ) as post:
+            assert setup.test_model("mistral")
+            assert setup.test_model("mistral")
+            assert post.call_count == 1
+            assert (isolated_cache_dir / "model_tests.json").exists()
+
+            # A re-pulled model has a new digest and is tested again
+            setup._tags_cache = (0.0, {"mistral": "sha256:def"})
+            with patch("scixtract.setup.TAGS_CACHE_TTL", float("inf")):
+                assert setup.test_model("mistral")
+            assert post.call_count == 2
+
+        # Expired passes are not trusted
+        tags = _tags_response("mistral", digest="sha256:def")
+        with patch.object(setup._session, "get", return_value=tags), patch.object(
+            setup._session, "post", return_value=_generate_response("{}")
+        ) as post, patch("scixtract.setup.MODEL_TEST_CACHE_TTL", 0):
+            setup._tags_cache = None
+            assert setup.test_model("mistral")
+        post.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "cache",
+        [
+            ["not", "a", "dict"],
+            {"mistral": {"digest": "sha256:abc", "passed": True, "timestamp": "x"}},
+        ],
+    )
+    def test_damaged_model_test_cache_forces_retest(self, isolated_cache_dir, cache):
+        """Test that unreadable cached passes only cause the model to be tested."""
+        isolated_cache_dir.mkdir(parents=True, exist_ok=True)
+        (isolated_cache_dir / "model_tests.json").write_text(json.dumps(cache))
+
+        setup = OllamaSetup()
+        assert not setup._cached_model_test("mistral", "sha256:abc")